@@ -6,5 +6,7 @@ class AccountsConfig(AppConfig):
     name = 'accounts'
 
     def ready(self):
-        # Ensure signals in models are registered
+        # Ensure signals in models, the user cache and system checks are registered
         from . import models  # noqa: F401
+        from . import backends  # noqa: F401
+        from . import checks  # noqa: F401
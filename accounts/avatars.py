@@ -0,0 +1,261 @@
+import hashlib
+import logging
+import struct
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
+
+
+logger = logging.getLogger(__name__)
+
+# Avatars are streamed to a temporary file in 64 KB chunks and rejected once
+# AVATAR_MAX_BYTES have arrived. Stored files are named by the SHA-256 of the
+# upload (avatars/<h[:2]>/<h>/original.<ext>), so identical uploads share one
+# copy, and the AVATAR_SIZES thumbnails are written next to the original once,
+# at upload time. Without Pillow (see the accounts.W001 system check) only the
+# original is stored and served, and uploads are validated by parsing the
+# image header for its dimensions instead of by opening the image.
+AVATAR_MAX_BYTES = getattr(settings, 'AVATAR_MAX_BYTES', 2 * 1024 * 1024)
+AVATAR_MAX_PIXELS = getattr(settings, 'AVATAR_MAX_PIXELS', 40_000_000)
+AVATAR_SIZES = tuple(sorted(getattr(settings, 'AVATAR_SIZES', (64, 128, 256))))
+AVATAR_DIR = 'avatars'
+
+# Leading bytes -> (extension, Pillow format)
+SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', ('png', 'PNG')),
+    (b'\xff\xd8\xff', ('jpg', 'JPEG')),
+    (b'GIF87a', ('gif', 'GIF')),
+    (b'GIF89a', ('gif', 'GIF')),
+)
+
+
+class AvatarUploadHandler(FileUploadHandler):
+    """Stream uploads to disk, hashing as they arrive, up to AVATAR_MAX_BYTES.
+
+    Install it as the only handler so no upload is buffered in memory; files
+    over the limit are dropped and their field names collected in ``rejected``.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, request=None, max_bytes=None):
+        super().__init__(request)
+        self.max_bytes = AVATAR_MAX_BYTES if max_bytes is None else max_bytes
+        self.rejected = set()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.received = 0
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_bytes:
+            self.rejected.add(self.field_name)
+            self.file.close()
+            raise SkipFile()
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.digest.hexdigest()
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.file.close()
+
+
+def _file_hash(upload):
+    digest = getattr(upload, 'sha256', None)
+    if digest:
+        return digest
+    digest = hashlib.sha256()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sniff(upload):
+    upload.seek(0)
+    head = upload.read(16)
+    upload.seek(0)
+    for magic, kind in SIGNATURES:
+        if head.startswith(magic):
+            return kind
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return ('webp', 'WEBP')
+    return None
+
+
+def _jpeg_size(upload):
+    # Walk the marker segments up to the first start-of-frame.
+    if upload.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        byte = upload.read(1)
+        if byte != b'\xff':
+            return None
+        marker = upload.read(1)
+        while marker == b'\xff':
+            marker = upload.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code == 0x01 or 0xd0 <= code <= 0xd7:
+            continue
+        if code in (0xd9, 0xda):
+            # End of image or start of scan before any frame header.
+            return None
+        length = upload.read(2)
+        if len(length) != 2 or struct.unpack('>H', length)[0] < 2:
+            return None
+        segment = struct.unpack('>H', length)[0] - 2
+        if 0xc0 <= code <= 0xcf and code not in (0xc4, 0xc8, 0xcc):
+            frame = upload.read(5)
+            if len(frame) != 5:
+                return None
+            height, width = struct.unpack('>xHH', frame)
+            return width, height
+        upload.seek(segment, 1)
+
+
+def _header_size(upload, image_format):
+    """(width, height) from the image header, or None if it is malformed."""
+    upload.seek(0)
+    try:
+        if image_format == 'JPEG':
+            return _jpeg_size(upload)
+        head = upload.read(30)
+    finally:
+        upload.seek(0)
+    if image_format == 'PNG':
+        if len(head) < 24 or head[12:16] != b'IHDR':
+            return None
+        return struct.unpack('>II', head[16:24])
+    if image_format == 'GIF':
+        if len(head) < 10:
+            return None
+        return struct.unpack('<HH', head[6:10])
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and len(head) >= 30 and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3fff, height & 0x3fff
+    if chunk == b'VP8L' and len(head) >= 25 and head[20] == 0x2f:
+        bits = struct.unpack('<I', head[21:25])[0]
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b'VP8X' and len(head) >= 30:
+        return (int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1)
+    return None
+
+
+def validate_avatar(upload):
+    """Reject oversized, non-image or decompression-bomb uploads.
+
+    Only headers are read; the pixels are decoded later by store_avatar().
+    """
+    if upload.size > AVATAR_MAX_BYTES:
+        raise ValidationError(f'Avatars must be at most {AVATAR_MAX_BYTES // 1024} KB.')
+    kind = _sniff(upload)
+    if kind is None:
+        raise ValidationError('Upload a PNG, JPEG, GIF or WebP image.')
+    if Image is not None:
+        try:
+            with Image.open(upload) as image:
+                width, height = image.size
+        except Exception:
+            raise ValidationError('The uploaded file is not a valid image.')
+        finally:
+            upload.seek(0)
+    else:
+        size = _header_size(upload, kind[1])
+        if not size or not all(size):
+            raise ValidationError('The uploaded file is not a valid image.')
+        width, height = size
+    if width * height > AVATAR_MAX_PIXELS:
+        raise ValidationError('The uploaded image has too many pixels.')
+
+
+def _variant_name(base, size, ext):
+    return f'{base}/{size}.{ext}'
+
+
+def _write_variants(original, base, ext, image_format):
+    with default_storage.open(original) as fh, Image.open(fh) as image:
+        if image_format == 'JPEG':
+            # Let the decoder scale down by up to 8x instead of decoding
+            # the full-size image.
+            image.draft('RGB', (AVATAR_SIZES[-1], AVATAR_SIZES[-1]))
+        image = ImageOps.exif_transpose(image)
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        for size in AVATAR_SIZES:
+            name = _variant_name(base, size, ext)
+            if max(image.size) <= size:
+                # Never upscale; avatar_url() falls back to the original.
+                break
+            if default_storage.exists(name):
+                continue
+            thumb = image.copy()
+            thumb.thumbnail((size, size))
+            out = BytesIO()
+            thumb.save(out, format=image_format)
+            default_storage.save(name, ContentFile(out.getvalue()))
+
+
+def store_avatar(upload):
+    """Store ``upload`` under its content hash with its thumbnails.
+
+    Returns the storage name of the original. Uploading a file that is
+    already stored only fills in thumbnails that are missing.
+    """
+    ext, image_format = _sniff(upload)
+    digest = _file_hash(upload)
+    base = f'{AVATAR_DIR}/{digest[:2]}/{digest}'
+    original = f'{base}/original.{ext}'
+    if not default_storage.exists(original):
+        upload.seek(0)
+        default_storage.save(original, upload)
+    if Image is not None:
+        try:
+            _write_variants(original, base, ext, image_format)
+        except Exception:
+            logger.exception('Could not generate thumbnails for %s', original)
+    return original
+
+
+@lru_cache(maxsize=4096)
+def _best_variant(name, size):
+    # Stored files never change under a given name, so lookups can be kept.
+    base, _, filename = name.rpartition('/')
+    if not filename.startswith('original.'):
+        # Uploaded before content addressing; there are no thumbnails.
+        return name
+    ext = filename.split('.', 1)[1]
+    for candidate in AVATAR_SIZES:
+        if candidate >= size:
+            variant = _variant_name(base, candidate, ext)
+            if default_storage.exists(variant):
+                return variant
+    return name
+
+
+def avatar_url(profile, size):
+    """URL of the smallest stored variant at least ``size`` pixels wide."""
+    if profile is None or not profile.avatar:
+        return ''
+    return default_storage.url(_best_variant(profile.avatar.name, int(size)))
@@ -0,0 +1,126 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.core.cache import caches
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Profile
+
+
+UserModel = get_user_model()
+
+USER_CACHE_ALIAS = getattr(settings, 'USER_CACHE_ALIAS', 'default')
+# Bounds how long a user changed outside the ORM (raw SQL, another
+# deployment sharing the DB) can be served stale.
+USER_CACHE_TIMEOUT = getattr(settings, 'USER_CACHE_TIMEOUT', 300)
+
+
+def _database_tag():
+    # The cache directory is shared by everything run from this checkout
+    # (scripts, test databases); keying on the database keeps one database's
+    # user ids from resolving to another's users.
+    name = str(connections['default'].settings_dict['NAME'])
+    return hashlib.sha256(name.encode('utf-8')).hexdigest()[:12]
+
+
+def user_cache_key(user_id):
+    return f'accounts:user:{_database_tag()}:{user_id}'
+
+
+def _cache_entry(user):
+    """The cached form of ``user``: field values without the password hash."""
+    profile = getattr(user, 'profile', None)
+    return {
+        'user': {f.attname: getattr(user, f.attname) for f in UserModel._meta.concrete_fields if f.attname != 'password'},
+        'profile': {f.attname: getattr(profile, f.attname) for f in Profile._meta.concrete_fields} if profile else None,
+        # The same HMACs the session stores, so sessions verify without the
+        # password hash.
+        'session_hashes': [user.get_session_auth_hash(), *user.get_session_auth_fallback_hash()],
+    }
+
+
+def _user_from_entry(entry):
+    fields = entry['user']
+    # password is left deferred: reading it loads it from the database, and
+    # save() writes only the loaded fields, so it is never overwritten.
+    user = UserModel.from_db('default', list(fields), list(fields.values()))
+    hashes = entry['session_hashes']
+
+    # The cached HMACs stand in only while password is still deferred; once
+    # it is loaded or set (set_password() followed by
+    # update_session_auth_hash()), the hash is computed from it as usual.
+    def get_session_auth_hash():
+        if 'password' in user.__dict__:
+            return UserModel.get_session_auth_hash(user)
+        return hashes[0]
+
+    def get_session_auth_fallback_hash():
+        if 'password' in user.__dict__:
+            return UserModel.get_session_auth_fallback_hash(user)
+        return iter(hashes[1:])
+
+    def set_password(raw_password):
+        UserModel.set_password(user, raw_password)
+        invalidate_cached_user(user.pk)
+
+    user.get_session_auth_hash = get_session_auth_hash
+    user.get_session_auth_fallback_hash = get_session_auth_fallback_hash
+    user.set_password = set_password
+    if entry['profile'] is not None:
+        values = entry['profile']
+        profile = Profile.from_db('default', list(values), list(values.values()))
+        Profile.user.field.set_cached_value(profile, user)
+        Profile.user.field.remote_field.set_cached_value(user, profile)
+    return user
+
+
+def invalidate_cached_user(user_id):
+    caches[USER_CACHE_ALIAS].delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user(), run by AuthenticationMiddleware on every
+    request, is served from the cache instead of auth_user.
+
+    The user is cached with its profile, minus the password hash. Saves and
+    deletes of either, set_password(), logins and logouts drop the entry, so
+    password changes still invalidate other sessions.
+    """
+
+    def get_user(self, user_id):
+        cache = caches[USER_CACHE_ALIAS]
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+        if entry is not None:
+            user = _user_from_entry(entry)
+        else:
+            try:
+                user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, _cache_entry(user), USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+
+@receiver(post_save, sender=UserModel)
+@receiver(post_delete, sender=UserModel)
+def _drop_cached_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def _drop_cached_profile_owner(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(user_logged_in)
+@receiver(user_logged_out)
+def _drop_cached_user_on_login_or_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
@@ -0,0 +1,18 @@
+from django.core import checks
+
+from . import avatars
+
+
+@checks.register(checks.Tags.compatibility)
+def check_pillow(app_configs, **kwargs):
+    """Warn when Pillow is missing, since avatars then get no thumbnails."""
+    if avatars.Image is not None:
+        return []
+    return [
+        checks.Warning(
+            'Pillow is not installed, so avatar thumbnails are not generated '
+            'and every page serves the full-size original.',
+            hint='Install it with "pip install Pillow".',
+            id='accounts.W001',
+        )
+    ]
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from .avatars import store_avatar, validate_avatar
 from .models import Profile
 
 
@@ -32,13 +33,40 @@ class ProfileForm(forms.ModelForm):
 
 
 class ProfileDetailsForm(forms.ModelForm):
+    # Not a model field: uploads are stored by accounts.avatars.store_avatar
+    # under their content hash rather than by the FileField's upload_to.
+    avatar = forms.FileField(required=False)
+
     class Meta:
         model = Profile
         fields = (
-            "avatar", "bio", "company", "job_title", "location", "website",
+            "bio", "company", "job_title", "location", "website",
             "github", "linkedin", "primary_language", "interests"
         )
         widgets = {
             "bio": forms.Textarea(attrs={"rows": 4}),
             "interests": forms.Textarea(attrs={"rows": 3}),
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.avatar:
+            self.initial.setdefault("avatar", self.instance.avatar)
+
+    def clean_avatar(self):
+        avatar = self.cleaned_data.get("avatar")
+        if avatar:
+            validate_avatar(avatar)
+        return avatar
+
+    def save(self, commit=True):
+        profile = super().save(commit=False)
+        avatar = self.cleaned_data.get("avatar")
+        if avatar:
+            profile.avatar.name = store_avatar(avatar)
+        elif avatar is False:
+            # "Clear" was ticked; the file stays, other profiles may share it.
+            profile.avatar = None
+        if commit:
+            profile.save()
+        return profile
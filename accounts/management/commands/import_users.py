@@ -0,0 +1,227 @@
+"""
+Bulk-create users and their profiles from a CSV or NDJSON file.
+
+Each row needs a ``username``. Optional columns are ``email``,
+``first_name`` and ``last_name``, plus any Profile field (``company``,
+``job_title``, ``primary_language``, ...). A row sets its password in one
+of two ways:
+
+* ``password``: plain text, hashed in a process pool.
+* ``password_hash``: an already-encoded Django hash, stored as is.
+
+A row with neither gets an unusable password, so the user must reset it.
+
+Rows go in with bulk_create, one transaction per --batch-size rows. The
+per-user post_save receiver that creates each Profile is bypassed; the
+profiles are bulk-inserted alongside the users. Rows whose username
+already exists, or that fail the model fields' validation, are skipped and
+reported. A batch that collides with a concurrent insert is retried once
+without the usernames that were taken, then skipped and reported.
+
+Usage: python manage.py import_users users.csv [--format csv|ndjson]
+                                    [--batch-size 1000] [--workers N]
+       cat users.ndjson | python manage.py import_users - --format ndjson
+"""
+import csv
+import json
+import os
+import secrets
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from accounts.models import Profile
+
+
+User = get_user_model()
+
+USER_FIELDS = ('username', 'email', 'first_name', 'last_name')
+PROFILE_FIELDS = tuple(
+    field.name for field in Profile._meta.concrete_fields
+    if field.name not in ('id', 'user', 'avatar')
+)
+
+
+def _unusable_password():
+    # What make_password(None) stores, without get_random_string()'s
+    # per-character overhead, which dominates passwordless imports.
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(30)
+
+
+def _read_rows(stream, fmt):
+    """Yield (line number, row dict) from ``stream``."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, exc
+            continue
+        yield number, row if isinstance(row, dict) else ValueError('expected a JSON object')
+
+
+def _clean_field(model, field, value):
+    try:
+        return model._meta.get_field(field).clean(value, None)
+    except ValidationError as exc:
+        raise ValidationError([f'{field}: {message}' for message in exc.messages])
+
+
+def _clean_row(row):
+    """Return (user fields, profile fields, password, encoded hash) for a row.
+
+    Values go through the model fields' own clean() (length, choices, URL
+    and e-mail validators), without the database checks a ModelForm adds.
+    """
+    for field in (*USER_FIELDS, *PROFILE_FIELDS, 'password', 'password_hash'):
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ValidationError(f'{field} must be a string, not {type(value).__name__}')
+    user = {field: _clean_field(User, field, (row.get(field) or '').strip()) for field in USER_FIELDS}
+    if not user['username']:
+        raise ValidationError('username is required')
+    profile = {
+        field: _clean_field(Profile, field, row[field].strip())
+        for field in PROFILE_FIELDS if row.get(field)
+    }
+    encoded = row.get('password_hash') or ''
+    if encoded:
+        try:
+            identify_hasher(encoded)
+        except ValueError:
+            raise ValidationError('password_hash is not a recognised Django hash')
+    return user, profile, row.get('password') or '', encoded
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create users and profiles from a CSV or NDJSON file ("-" for stdin).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='input file, or - for stdin')
+        parser.add_argument('--format', choices=('csv', 'ndjson'), help='defaults to the file extension, else csv')
+        parser.add_argument('--batch-size', type=int, default=1000, help='rows per transaction')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='password hashing processes')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        batch_size = max(1, options['batch_size'])
+        self.created = self.skipped = 0
+        self.started = time.perf_counter()
+        self.seen = set()
+
+        try:
+            stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        # Hashing for the next batch runs in the pool while the current one
+        # is inserted.
+        pending = deque()
+        with stream, ProcessPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            batch = []
+            for number, row in _read_rows(stream, fmt):
+                entry = self._prepare(number, row)
+                if entry is not None:
+                    batch.append(entry)
+                if len(batch) >= batch_size:
+                    pending.append(self._submit(pool, batch, options['workers']))
+                    batch = []
+                    if len(pending) > 1:
+                        self._insert(*pending.popleft())
+            if batch:
+                pending.append(self._submit(pool, batch, options['workers']))
+            while pending:
+                self._insert(*pending.popleft())
+
+        elapsed = time.perf_counter() - self.started
+        rate = self.created / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {self.created} users ({self.skipped} skipped) in {elapsed:.1f}s, {rate:,.0f} users/s'
+        ))
+
+    def _prepare(self, number, row):
+        if isinstance(row, Exception):
+            return self._skip(number, row)
+        try:
+            user, profile, password, encoded = _clean_row(row)
+        except ValidationError as exc:
+            return self._skip(number, '; '.join(exc.messages))
+        if user['username'] in self.seen:
+            return self._skip(number, f"duplicate username {user['username']!r}")
+        self.seen.add(user['username'])
+        return user, profile, password, encoded
+
+    def _skip(self, number, reason):
+        self.skipped += 1
+        self.stderr.write(f'line {number}: skipped, {reason}')
+        return None
+
+    def _submit(self, pool, batch, workers):
+        plain = [password for _, _, password, encoded in batch if password and not encoded]
+        # make_password is pickled by reference, so workers need only the
+        # settings module, not this app, whatever the start method.
+        chunk = max(1, -(-len(plain) // max(1, workers)))
+        return batch, pool.map(make_password, plain, chunksize=chunk)
+
+    def _insert(self, batch, hashes):
+        rows = []
+        for user, profile, password, encoded in batch:
+            if password and not encoded:
+                encoded = next(hashes)
+            rows.append((user, profile, encoded))
+        # Another process may insert one of these usernames between the
+        # existence check and the insert; the batch is then retried once
+        # without the usernames that are now taken.
+        for attempt in (1, 2):
+            rows = self._drop_existing(rows)
+            try:
+                self._create(rows)
+            except IntegrityError as exc:
+                if attempt == 1:
+                    self.stderr.write(f'batch of {len(rows)} rows conflicted with another insert ({exc}); retrying')
+                    continue
+                self.skipped += len(rows)
+                self.stderr.write(self.style.ERROR(f'batch of {len(rows)} rows skipped: {exc}'))
+                return
+            break
+        self.created += len(rows)
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(f'{self.created} users, {self.created / elapsed:,.0f}/s')
+
+    def _drop_existing(self, rows):
+        existing = set(
+            User.objects.filter(username__in=[user['username'] for user, _, _ in rows])
+            .values_list('username', flat=True)
+        )
+        kept = []
+        for row in rows:
+            if row[0]['username'] in existing:
+                self.skipped += 1
+                self.stderr.write(f"skipped {row[0]['username']!r}: already exists")
+            else:
+                kept.append(row)
+        return kept
+
+    def _create(self, rows):
+        users = [User(password=encoded or _unusable_password(), **user) for user, _, encoded in rows]
+        with transaction.atomic():
+            # bulk_create() sends no post_save, so create_user_profile does
+            # not run and the profiles are inserted here instead.
+            User.objects.bulk_create(users)
+            Profile.objects.bulk_create(
+                Profile(user_id=user.pk, **profile) for user, (_, profile, _) in zip(users, rows)
+            )
@@ -0,0 +1,12 @@
+from django import template
+
+from accounts.avatars import avatar_url as _avatar_url
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def avatar_url(profile, size):
+    """{% avatar_url profile 128 %}: the smallest stored variant that fits."""
+    return _avatar_url(profile, size)
@@ -3,7 +3,9 @@ from django.contrib.auth import login
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 
+from .avatars import AVATAR_MAX_BYTES, AvatarUploadHandler
 from .forms import RegisterForm, ProfileForm, ProfileDetailsForm
 
 
@@ -50,14 +52,28 @@ def logout_immediate(request):
     return redirect('home')
 
 
+@csrf_exempt
 @login_required
 def my_account(request):
+    # Upload handlers must be swapped before anything reads request.POST,
+    # which CsrfViewMiddleware would otherwise do; the check runs below.
+    upload = AvatarUploadHandler(request)
+    request.upload_handlers = [upload]
+    return _my_account(request, upload)
+
+
+@csrf_protect
+def _my_account(request, upload):
     user = request.user
     profile = getattr(user, 'profile', None)
     if request.method == 'POST':
         user_form = ProfileForm(request.POST, instance=user)
         profile_form = ProfileDetailsForm(request.POST, request.FILES, instance=profile)
-        if user_form.is_valid() and profile_form.is_valid():
+        valid = user_form.is_valid() and profile_form.is_valid()
+        if 'avatar' in upload.rejected:
+            profile_form.add_error('avatar', f'Avatars must be at most {AVATAR_MAX_BYTES // 1024} KB.')
+            valid = False
+        if valid:
             user_form.save()
             profile_form.save()
             messages.success(request, 'Your profile has been updated.')
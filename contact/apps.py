@@ -1,7 +1,16 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class ContactConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contact'
 
+    def ready(self):
+        from . import queue
+
+        if queue.CONTACT_WRITE_BEHIND:
+            # Start the write-behind thread with the first request, so a
+            # restarted server claims orphaned spools without waiting for
+            # the next submission; management commands never start it.
+            request_started.connect(queue.start_worker, dispatch_uid='contact.queue.start_worker')
@@ -0,0 +1,17 @@
+"""
+Insert queued contact form submissions now, including spools left behind by
+server processes that exited.
+
+Usage: python manage.py flush_contact_queue
+"""
+from django.core.management.base import BaseCommand
+
+from contact import queue
+
+
+class Command(BaseCommand):
+    help = 'Insert queued contact messages, claiming spools of exited processes.'
+
+    def handle(self, *args, **options):
+        inserted = queue.flush()
+        self.stdout.write(self.style.SUCCESS(f'Inserted {inserted} queued contact messages'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Databases whose contact table was created by "migrate --run-syncdb"
+    # before this app had migrations already have the table, so a plain
+    # "migrate" fails with "table already exists". Mark this migration as
+    # applied first, then migrate as usual to add the search index:
+    #
+    #     python manage.py migrate contact 0001 --fake-initial
+    #     python manage.py migrate
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150)),
+                ('email', models.EmailField(max_length=254)),
+                ('subject', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+            ],
+        ),
+    ]
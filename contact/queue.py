@@ -0,0 +1,255 @@
+import atexit
+import itertools
+import json
+import logging
+import os
+import secrets
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ContactMessage
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+# Write-behind mode: contact_view appends validated submissions to a
+# per-process spool file (fsynced, so an accepted message survives a crash)
+# and a background thread inserts them with bulk_create once
+# CONTACT_QUEUE_BATCH_SIZE are waiting or CONTACT_QUEUE_FLUSH_SECONDS have
+# passed, and once more at exit. Every serving process runs the thread from
+# its first request, so spools left by a process that died are claimed within
+# CONTACT_QUEUE_FLUSH_SECONDS even if nobody submits the form again;
+# "manage.py flush_contact_queue" does the same from the command line. A
+# process holds an flock on its <pid>-<token>.lock for as long as it lives, so
+# a free lock, not a missing PID, marks its files as orphaned. Delivery is
+# at-least-once: a crash between the insert and removing the batch file
+# replays that batch.
+CONTACT_WRITE_BEHIND = getattr(settings, 'CONTACT_WRITE_BEHIND', False)
+CONTACT_QUEUE_DIR = Path(getattr(settings, 'CONTACT_QUEUE_DIR', Path(settings.BASE_DIR) / '.contact-queue'))
+CONTACT_QUEUE_BATCH_SIZE = getattr(settings, 'CONTACT_QUEUE_BATCH_SIZE', 100)
+CONTACT_QUEUE_FLUSH_SECONDS = getattr(settings, 'CONTACT_QUEUE_FLUSH_SECONDS', 2.0)
+
+FIELDS = ('name', 'email', 'subject', 'message')
+
+_append_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_wakeup = threading.Condition()
+_pending = 0
+_batch_ids = itertools.count()
+_worker = None
+_stopping = False
+# (file stem, lock file descriptor) of this process
+_owner = None
+
+
+def _own_stem():
+    """Name this process's files, taking its lock first; call with _append_lock held."""
+    global _owner
+    if _owner is None:
+        stem = f'{os.getpid()}-{secrets.token_hex(4)}'
+        fd = None
+        if fcntl is not None:
+            # Locked before it gets its final name, so no other process can
+            # see it free while this one is alive.
+            fd, tmp = tempfile.mkstemp(prefix='.lock.', dir=CONTACT_QUEUE_DIR)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            os.replace(tmp, CONTACT_QUEUE_DIR / f'{stem}.lock')
+        _owner = (stem, fd)
+    return _owner[0]
+
+
+def _after_fork():
+    # A forked child queues under its own name and needs its own thread;
+    # the parent's spool stays the parent's.
+    global _owner, _worker, _pending
+    if _owner is not None and _owner[1] is not None:
+        os.close(_owner[1])
+    _owner = None
+    _worker = None
+    _pending = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _spool_path():
+    return CONTACT_QUEUE_DIR / f'{_own_stem()}.spool'
+
+
+def enqueue_message(cleaned_data):
+    """Durably queue one validated submission for the background insert."""
+    global _pending
+    record = {field: cleaned_data[field] for field in FIELDS}
+    record['created_at'] = timezone.now().isoformat()
+    line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+    with _append_lock:
+        CONTACT_QUEUE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(_spool_path(), 'ab') as fh:
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+    _ensure_worker()
+    with _wakeup:
+        _pending += 1
+        if _pending >= CONTACT_QUEUE_BATCH_SIZE:
+            _wakeup.notify()
+
+
+def _owner_stem(path):
+    if path.suffix == '.batch':
+        return path.stem.rsplit('-', 1)[0]
+    if path.suffix in ('.spool', '.lock'):
+        return path.stem
+    return None
+
+
+def _claim_orphans():
+    """Rename spool and batch files of exited processes into our own batches."""
+    if fcntl is None:
+        # Liveness cannot be told apart without flock; leave other files be.
+        return
+    me = _owner[0]
+    orphans = {}
+    for path in CONTACT_QUEUE_DIR.glob('*.*'):
+        stem = _owner_stem(path)
+        if stem is not None and stem != me:
+            orphans.setdefault(stem, []).append(path)
+    for stem, paths in orphans.items():
+        lock = CONTACT_QUEUE_DIR / f'{stem}.lock'
+        try:
+            fd = os.open(lock, os.O_RDWR)
+        except FileNotFoundError:
+            # Written before lock files existed, or just claimed by another worker.
+            fd = None
+        try:
+            if fd is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Its owner is alive.
+                    continue
+            for path in paths:
+                if path.suffix == '.lock':
+                    continue
+                try:
+                    path.rename(CONTACT_QUEUE_DIR / f'{me}-{next(_batch_ids)}.batch')
+                except FileNotFoundError:
+                    # Another worker claimed it first.
+                    continue
+            if fd is not None:
+                try:
+                    lock.unlink()
+                except FileNotFoundError:
+                    pass
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+
+def _read_batch(path):
+    messages = []
+    lines = path.read_bytes().splitlines()
+    for number, line in enumerate(lines, 1):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # Only the final line can be torn, by a crash mid-append.
+            if number != len(lines):
+                logger.error("Skipping corrupted contact queue record %d in %s", number, path)
+            continue
+        messages.append(ContactMessage(
+            created_at=parse_datetime(record['created_at']),
+            **{field: record[field] for field in FIELDS},
+        ))
+    return messages
+
+
+def flush():
+    """Insert everything queued by this process (and orphaned spools) now.
+
+    Returns the number of messages inserted.
+    """
+    global _pending
+    if not CONTACT_QUEUE_DIR.exists():
+        return 0
+    inserted = 0
+    with _flush_lock:
+        with _append_lock, _wakeup:
+            me = _own_stem()
+            spool = _spool_path()
+            if spool.exists():
+                spool.rename(CONTACT_QUEUE_DIR / f'{me}-{next(_batch_ids)}.batch')
+            _pending = 0
+        _claim_orphans()
+        batches = sorted(
+            CONTACT_QUEUE_DIR.glob(f'{me}-*.batch'),
+            key=lambda path: path.stat().st_mtime_ns,
+        )
+        for path in batches:
+            messages = _read_batch(path)
+            try:
+                with transaction.atomic():
+                    ContactMessage.objects.bulk_create(messages, batch_size=CONTACT_QUEUE_BATCH_SIZE)
+            except Exception:
+                # Leave the batch in place; the next flush retries it.
+                logger.exception("Could not insert %d queued contact messages from %s", len(messages), path)
+                break
+            path.unlink()
+            inserted += len(messages)
+    return inserted
+
+
+def _run():
+    while True:
+        with _wakeup:
+            if not _stopping and _pending < CONTACT_QUEUE_BATCH_SIZE:
+                _wakeup.wait(CONTACT_QUEUE_FLUSH_SECONDS)
+            stopping = _stopping
+        try:
+            flush()
+        finally:
+            close_old_connections()
+        if stopping:
+            return
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _wakeup:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='contact-write-behind', daemon=True)
+            _worker.start()
+
+
+def start_worker(**kwargs):
+    """Start the background thread; connected to request_started when write-behind is on."""
+    _ensure_worker()
+
+
+def shutdown(timeout=10.0):
+    """Stop the worker after a final flush; registered to run at exit."""
+    global _stopping
+    worker = _worker
+    if worker is None:
+        return
+    with _wakeup:
+        _stopping = True
+        _wakeup.notify()
+    worker.join(timeout)
+
+
+atexit.register(shutdown)
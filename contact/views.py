@@ -2,13 +2,17 @@ from django.contrib import messages
 from django.shortcuts import render, redirect
 
 from .forms import ContactForm
+from .queue import CONTACT_WRITE_BEHIND, enqueue_message
 
 
 def contact_view(request):
     if request.method == 'POST':
         form = ContactForm(request.POST)
         if form.is_valid():
-            form.save()
+            if CONTACT_WRITE_BEHIND:
+                enqueue_message(form.cleaned_data)
+            else:
+                form.save()
             messages.success(request, 'Thanks! Your message has been sent.')
             return redirect('contact')
         else:
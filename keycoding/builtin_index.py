@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .langdata import get_language_data
+
+
+BUILTIN_GROUPS = ('functions', 'methods', 'classes', 'modules', 'libraries')
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+_CLASS_MARKERS = ('class', 'type', 'enum', 'object', 'struct', 'interface')
+_MODULE_MARKERS = ('module', 'package', 'namespace')
+
+# slug -> (source document, index). The document is compared by identity so an
+# index is rebuilt whenever get_language_data hands out a fresh document.
+_indexes: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+_indexes_lock = threading.Lock()
+
+
+def builtin_group(kind: str) -> str:
+    """Classify a built-in ``kind`` into one of BUILTIN_GROUPS."""
+    kind = kind.lower()
+    if 'method' in kind:
+        return 'methods'
+    if any(marker in kind for marker in _CLASS_MARKERS):
+        return 'classes'
+    if any(marker in kind for marker in _MODULE_MARKERS):
+        return 'modules'
+    if 'library' in kind:
+        return 'libraries'
+    return 'functions'
+
+
+def _build_index(doc: Dict[str, Any]) -> Dict[str, Any]:
+    items: List[Dict[str, Any]] = []
+    haystacks: List[str] = []
+    by_group: Dict[str, List[int]] = {group: [] for group in BUILTIN_GROUPS}
+    for position, entry in enumerate(doc.get('builtins', [])):
+        group = builtin_group(entry.get('kind', ''))
+        items.append({**entry, 'index': position, 'group': group})
+        haystacks.append(' '.join(
+            entry.get(field, '') for field in ('name', 'kind', 'signature', 'description')
+        ).lower())
+        by_group[group].append(position)
+    return {
+        'items': items,
+        'haystacks': haystacks,
+        'by_group': by_group,
+        'counts': {group: len(positions) for group, positions in by_group.items()},
+    }
+
+
+def get_builtin_index(slug: str) -> Dict[str, Any]:
+    """Return the precomputed built-ins index for ``slug``."""
+    doc = get_language_data(slug)
+    with _indexes_lock:
+        entry = _indexes.get(slug)
+        if entry is not None and entry[0] is doc:
+            return entry[1]
+    index = _build_index(doc)
+    with _indexes_lock:
+        _indexes[slug] = (doc, index)
+    return index
+
+
+def search_builtins(
+    index: Dict[str, Any],
+    *,
+    query: str = '',
+    group: Optional[str] = None,
+    offset: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """Filter the index by substring ``query`` and ``group``; return (total, page)."""
+    if group in BUILTIN_GROUPS:
+        positions = index['by_group'][group]
+    else:
+        positions = range(len(index['items']))
+    query = query.strip().lower()
+    if query:
+        haystacks = index['haystacks']
+        positions = [pos for pos in positions if query in haystacks[pos]]
+    items = index['items']
+    page = [items[pos] for pos in positions[offset:offset + limit]]
+    return len(positions), page
+
+
+__all__ = [
+    'BUILTIN_GROUPS',
+    'DEFAULT_PAGE_SIZE',
+    'MAX_PAGE_SIZE',
+    'builtin_group',
+    'get_builtin_index',
+    'search_builtins',
+]
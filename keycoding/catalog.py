@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.dispatch import receiver
+from django.utils.text import slugify
+
+from .langdata import (
+    get_language_data,
+    language_data_saved,
+    language_data_stamp,
+    snapshot_language_summary,
+    summarize_language_data,
+)
+
+
+CATEGORIES: Dict[str, List[str]] = {
+    'Frontend': [
+        'JavaScript', 'TypeScript', 'HTML', 'CSS',
+    ],
+    'Backend Web': [
+        'Python', 'JavaScript', 'TypeScript', 'Java', 'C#', 'Go', 'PHP', 'Ruby', 'Rust', 'Kotlin',
+        'Scala', 'Elixir', 'Clojure', 'Crystal', 'Nim',
+    ],
+    'Mobile': [
+        'Swift', 'Kotlin', 'Dart', 'Objective-C',
+    ],
+    'Data / ML / Science': [
+        'Python', 'R', 'Julia', 'MATLAB', 'SQL',
+    ],
+    'Systems / Low-Level': [
+        'C', 'C++', 'Rust', 'Zig', 'Assembly', 'Ada',
+    ],
+    'Scripting / Automation': [
+        'Bash', 'Shell', 'PowerShell', 'Perl', 'Python', 'Lua',
+    ],
+    'Functional & Logic': [
+        'Haskell', 'Elixir', 'Erlang', 'F#', 'OCaml', 'Scheme', 'Clojure', 'Prolog',
+    ],
+    'Blockchain / Smart Contracts': [
+        'Solidity',
+    ],
+    'Legacy / Enterprise': [
+        'COBOL', 'Fortran', 'ABAP', 'Visual Basic .NET', 'Delphi', 'Groovy', 'Apex', 'Objective-C',
+        'Smalltalk',
+    ],
+    'Hardware / HDL': [
+        'VHDL', 'Verilog',
+    ],
+    'Game / Engines': [
+        'GDScript', 'Lua',
+    ],
+}
+
+# Names slugify() cannot turn into the langdata file name (C++ would collide
+# with C, and the punctuation in the others is dropped).
+SLUG_OVERRIDES = {
+    'C++': 'cpp',
+    'C#': 'csharp',
+    'F#': 'fsharp',
+    'Visual Basic .NET': 'vbnet',
+}
+
+
+def language_slug(name: str) -> str:
+    """Return the URL and langdata slug for a display name."""
+    return SLUG_OVERRIDES.get(name) or slugify(name)
+
+
+def _build() -> Tuple[Dict[str, str], Dict[str, List[str]], Dict[str, List[Dict[str, str]]]]:
+    names: Dict[str, str] = {}
+    categories: Dict[str, List[str]] = {}
+    tiles: Dict[str, List[Dict[str, str]]] = {}
+    for category, members in CATEGORIES.items():
+        tiles[category] = []
+        for name in members:
+            slug = language_slug(name)
+            names[slug] = name
+            categories.setdefault(slug, []).append(category)
+            tiles[category].append({'name': name, 'slug': slug})
+    return names, categories, tiles
+
+
+# Built once at import; the category definitions never change at runtime.
+_names, _categories, _tiles = _build()
+
+# slug -> (stamp, summary) for languages whose stats have been looked up.
+_summaries: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+_summaries_lock = threading.Lock()
+
+
+def resolve_language(slug: str) -> Optional[Tuple[str, List[str]]]:
+    """Return ``(display_name, categories)`` for ``slug``, or None if unknown."""
+    name = _names.get(slug)
+    if name is None:
+        return None
+    return name, _categories[slug]
+
+
+def language_categories(slug: str) -> List[str]:
+    return _categories.get(slug, [])
+
+
+def category_tiles() -> Dict[str, List[Dict[str, str]]]:
+    """Return category -> ``[{'name', 'slug'}]`` in dashboard order."""
+    return _tiles
+
+
+def language_summary(slug: str) -> Optional[Dict[str, Any]]:
+    """Return the name, version and entry counts of ``slug``, or None without data.
+
+    Summaries are served from memory or the snapshot index while the file's
+    stamp is unchanged; the document is only loaded when both are stale.
+    """
+    stamp = language_data_stamp(slug)
+    if stamp is None:
+        return None
+    with _summaries_lock:
+        entry = _summaries.get(slug)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+    summary = snapshot_language_summary(slug, stamp)
+    if summary is None:
+        summary = summarize_language_data(get_language_data(slug))
+    with _summaries_lock:
+        _summaries[slug] = (stamp, summary)
+    return summary
+
+
+def catalog_summaries() -> Dict[str, Optional[Dict[str, Any]]]:
+    """Return :func:`language_summary` for every catalogued language."""
+    return {slug: language_summary(slug) for slug in _names}
+
+
+@receiver(language_data_saved)
+def _drop_saved_summary(sender, slug, **kwargs):
+    with _summaries_lock:
+        _summaries.pop(slug, None)
+
+
+__all__ = [
+    'CATEGORIES',
+    'SLUG_OVERRIDES',
+    'language_slug',
+    'resolve_language',
+    'language_categories',
+    'category_tiles',
+    'language_summary',
+    'catalog_summaries',
+]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.dispatch import receiver
+
+from .langdata import get_language_data, language_data_saved
+
+
+# Rendered fragment name -> document sections it is built from. The names are
+# the ones used by the {% cache %} tags in language_dashboard.html.
+FRAGMENT_SECTIONS = {
+    'lang-quick-start': ('quick_start',),
+    'lang-concepts': ('concepts',),
+    'lang-tasks': ('common_tasks',),
+    'lang-projects': ('projects',),
+    'lang-glossary': ('glossary',),
+    'lang-tips': ('tips',),
+    'lang-builtins': ('builtins',),
+    'lang-ecosystem': ('stdlib', 'tools', 'links'),
+}
+SECTIONS = tuple(dict.fromkeys(key for keys in FRAGMENT_SECTIONS.values() for key in keys))
+
+# slug -> (source document, section digests); see builtin_index for the idea.
+_digests: Dict[str, Tuple[Dict[str, Any], Dict[str, str]]] = {}
+_digests_lock = threading.Lock()
+
+
+def fragment_cache_alias() -> str:
+    return getattr(settings, 'LANGDATA_FRAGMENT_CACHE', 'default')
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=12).hexdigest()
+
+
+def section_digests(slug: str) -> Dict[str, str]:
+    """Return a content hash per dashboard section of ``slug``."""
+    doc = get_language_data(slug)
+    with _digests_lock:
+        entry = _digests.get(slug)
+        if entry is not None and entry[0] is doc:
+            return entry[1]
+    digests = {section: _digest(doc.get(section, [])) for section in SECTIONS}
+    with _digests_lock:
+        _digests[slug] = (doc, digests)
+    return digests
+
+
+def _fragment_key(fragment: str, slug: str, digests: Dict[str, str]) -> str:
+    vary_on = [slug, *(digests[section] for section in FRAGMENT_SECTIONS[fragment])]
+    return make_template_fragment_key(fragment, vary_on)
+
+
+@receiver(language_data_saved)
+def _drop_stale_fragments(sender, slug, **kwargs):
+    # Keys already change with the content; this only frees the memory held by
+    # fragments of sections the save replaced.
+    with _digests_lock:
+        entry = _digests.pop(slug, None)
+    if entry is None:
+        return
+    previous = entry[1]
+    current = section_digests(slug)
+    stale = [
+        _fragment_key(fragment, slug, previous)
+        for fragment, sections in FRAGMENT_SECTIONS.items()
+        if any(previous[section] != current[section] for section in sections)
+    ]
+    if stale:
+        caches[fragment_cache_alias()].delete_many(stale)
+
+
+__all__ = [
+    'FRAGMENT_SECTIONS',
+    'fragment_cache_alias',
+    'section_digests',
+]
@@ -1,187 +1,616 @@
 from __future__ import annotations
 
 import json
-from copy import deepcopy
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from django.conf import settings
+from django.dispatch import Signal
 
+from .langschema import canonicalize_document, is_canonical, normalize_document
+from .metrics import inc, observe
+from .timing import record_span, span
 
-LANGDATA_DIR = Path(settings.BASE_DIR) / 'langdata'
-
-
-def _langdata_path(slug: str) -> Path:
-    return LANGDATA_DIR / f"{slug}.json"
-
-
-def load_language_data(slug: str) -> Dict[str, Any]:
-    """Load a language JSON document from disk."""
-    path = _langdata_path(slug)
-    if path.exists():
-        try:
-            return json.loads(path.read_text(encoding='utf-8'))
-        except json.JSONDecodeError:
-            # Return empty shell to avoid crashes if file is corrupted
-            return {"name": slug.title(), "slug": slug}
-    return {"name": slug.title(), "slug": slug}
-
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
 
-def save_language_data(slug: str, data: Dict[str, Any]) -> None:
-    """Persist the language JSON document back to disk."""
-    path = _langdata_path(slug)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    # We deep copy to avoid side-effects when dumping to JSON.
-    payload = deepcopy(data)
-    path.write_text(
-        json.dumps(payload, indent=2, ensure_ascii=False) + "\n",
-        encoding='utf-8',
-    )
-def _ensure_task(task: Any) -> Dict[str, Any]:
-    if isinstance(task, dict):
-        return {
-            'title': str(task.get('title', "")),
-            'description': str(task.get('description', "")),
-            'code': str(task.get('code', "")),
-        }
-    return {'title': "", 'description': "", 'code': ""}
 
+logger = logging.getLogger(__name__)
 
-def _ensure_task_group(group: Any) -> Dict[str, Any]:
-    name = ""
-    tasks: List[Any] = []
-    if isinstance(group, dict):
-        name = str(group.get('group', ""))
-        tasks = group.get('tasks', []) or []
-    return {
-        'group': name,
-        'tasks': [_ensure_task(t) for t in tasks],
-    }
-
-
-def _ensure_project_step(step: Any) -> Dict[str, Any]:
-    if isinstance(step, dict):
-        return {
-            'title': str(step.get('title', "")),
-            'text': str(step.get('text', "")),
-            'code': str(step.get('code', "")),
-        }
-    return {'title': "", 'text': "", 'code': ""}
-
-
-def _ensure_project(project: Any) -> Dict[str, Any]:
-    if isinstance(project, dict):
-        return {
-            'title': str(project.get('title', "")),
-            'summary': str(project.get('summary', "")),
-            'description': str(project.get('description', "")),
-            'steps': [_ensure_project_step(s) for s in project.get('steps', []) or []],
-        }
-    return {'title': "", 'summary': "", 'description': "", 'steps': []}
-
+LANGDATA_DIR = Path(settings.BASE_DIR) / 'langdata'
+LANGDATA_CACHE_SIZE = getattr(settings, 'LANGDATA_CACHE_SIZE', 64)
+LANGDATA_LOCK_WARN_SECONDS = getattr(settings, 'LANGDATA_LOCK_WARN_SECONDS', 0.5)
+# Journaled storage: saves append the diff to langdata/.<slug>.journal instead
+# of rewriting the document, and the journal is folded back into the JSON file
+# once it grows past LANGDATA_JOURNAL_COMPACT_BYTES.
+LANGDATA_JOURNAL = getattr(settings, 'LANGDATA_JOURNAL', False)
+LANGDATA_JOURNAL_COMPACT_BYTES = getattr(settings, 'LANGDATA_JOURNAL_COMPACT_BYTES', 256 * 1024)
+
+# (mtime_ns, size) of the JSON file, plus the journal's when one exists.
+Stamp = Tuple[int, ...]
+
+# Sent after save_language_data has written a document; receivers get ``slug``
+# and the saved ``data``.
+language_data_saved = Signal()
+
+# Snapshot layout: header (magic, format version, index length), the JSON
+# index mapping slug -> offset/length/stamp, then one compact JSON blob per
+# pre-normalized language.
+SNAPSHOT_MAGIC = b'KCLD'
+SNAPSHOT_FORMAT = 1
+_SNAPSHOT_HEADER = struct.Struct('<4sHQ')
+
+# slug -> (stamp, normalized document), most recently used last.
+_cache: 'OrderedDict[str, Tuple[Optional[Stamp], Dict[str, Any]]]' = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+# (file identity, mmap, index, offset of the first blob) for the mapped snapshot.
+_snapshot: Optional[Tuple[Tuple[int, int, int], mmap.mmap, Dict[str, Any], int]] = None
+_snapshot_lock = threading.Lock()
+_snapshot_stats = {'hits': 0, 'stale': 0}
+
+# Slugs whose advisory lock the current thread holds, making the lock reentrant.
+_held_locks = threading.local()
+# Used in place of flock() where fcntl is unavailable; only serializes threads.
+_fallback_locks: Dict[str, threading.Lock] = {}
+_lock_stats = {'acquisitions': 0, 'contended': 0, 'wait_total': 0.0, 'wait_max': 0.0}
+_lock_stats_lock = threading.Lock()
+
+
+class LanguageDataError(ValueError):
+    """Raised when a language file exists but cannot be decoded."""
 
-def _ensure_concept(concept: Any) -> Dict[str, Any]:
-    if isinstance(concept, dict):
-        return {
-            'id': str(concept.get('id', "")),
-            'title': str(concept.get('title', "")),
-            'tag': str(concept.get('tag', "")),
-            'description': str(concept.get('description', "")),
-            'code': str(concept.get('code', "")),
-        }
-    return {'id': "", 'title': "", 'tag': "", 'description': "", 'code': ""}
 
+def _langdata_path(slug: str) -> Path:
+    return LANGDATA_DIR / f"{slug}.json"
 
-def _ensure_quick_start(item: Any) -> Dict[str, Any]:
-    if isinstance(item, dict):
-        return {
-            'title': str(item.get('title', "")),
-            'description': str(item.get('description', "")),
-            'code': str(item.get('code', "")),
-        }
-    return {'title': "", 'description': "", 'code': ""}
 
+def _journal_path(slug: str) -> Path:
+    return LANGDATA_DIR / f".{slug}.journal"
 
-def _ensure_glossary_entry(item: Any) -> Dict[str, Any]:
-    if isinstance(item, dict):
-        return {
-            'term': str(item.get('term', "")),
-            'definition': str(item.get('definition', "")),
-        }
-    return {'term': "", 'definition': ""}
 
+def _snapshot_path() -> Path:
+    configured = getattr(settings, 'LANGDATA_SNAPSHOT_PATH', None)
+    return Path(configured) if configured else LANGDATA_DIR / '.snapshot.bin'
 
-def _ensure_tip(item: Any) -> Dict[str, Any]:
-    if isinstance(item, dict):
-        return {
-            'title': str(item.get('title', "")),
-            'note': str(item.get('note', item.get('text', ""))),
-        }
-    return {'title': "", 'note': str(item)}
 
+def language_slugs() -> List[str]:
+    """Return the slugs of every language file, skipping hidden build artifacts."""
+    return sorted(path.stem for path in LANGDATA_DIR.glob('*.json') if not path.name.startswith('.'))
 
-def _ensure_tool(item: Any) -> Dict[str, Any]:
-    if isinstance(item, dict):
-        return {
-            'name': str(item.get('name', item.get('title', ""))),
-            'description': str(item.get('description', "")),
-        }
-    return {'name': str(item), 'description': ""}
 
+def load_language_data(slug: str, *, strict: bool = False) -> Dict[str, Any]:
+    """Load a language JSON document from disk.
 
-def _ensure_link(item: Any) -> Dict[str, Any]:
-    if isinstance(item, dict):
-        return {
-            'title': str(item.get('title', "")),
-            'url': str(item.get('url', "")),
-            'description': str(item.get('description', "")),
-        }
-    return {'title': str(item), 'url': "", 'description': ""}
+    A corrupted file is served as an empty shell so pages keep rendering, unless
+    ``strict`` is set, in which case LanguageDataError is raised. Edits load
+    strictly so a damaged file is never overwritten with the shell.
+    """
+    path = _langdata_path(slug)
+    if path.exists():
+        with span('read'):
+            raw = path.read_bytes()
+        inc('keycoding_langdata_read_bytes_total', len(raw))
+        try:
+            with span('parse'):
+                data = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            if strict:
+                raise LanguageDataError(f"Language data for {slug} is corrupted and cannot be edited") from exc
+            logger.error("Corrupted language data in %s: %s", path, exc)
+            return {"name": slug.title(), "slug": slug}
+        with span('journal'):
+            return _replay_journal(slug, data, strict=strict)
+    return {"name": slug.title(), "slug": slug}
 
 
-def _ensure_builtin(item: Any) -> Dict[str, Any]:
-    if isinstance(item, dict):
-        return {
-            'name': str(item.get('name', "")),
-            'kind': str(item.get('kind', "")),
-            'signature': str(item.get('signature', "")),
-            'description': str(item.get('description', "")),
-        }
-    return {'name': "", 'kind': "", 'signature': "", 'description': ""}
+def _diff_documents(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the top-level operations that turn ``old`` into ``new``.
+
+    Lists are diffed as a single splice between their common prefix and
+    suffix, which covers every edit action with a record proportional to the
+    entries touched.
+    """
+    ops: List[Dict[str, Any]] = []
+    for key in old:
+        if key not in new:
+            ops.append({'op': 'del', 'key': key})
+    for key, value in new.items():
+        before = old.get(key)
+        if key in old and before == value:
+            continue
+        if isinstance(before, list) and isinstance(value, list):
+            start = 0
+            limit = min(len(before), len(value))
+            while start < limit and before[start] == value[start]:
+                start += 1
+            end = 0
+            while end < limit - start and before[-1 - end] == value[-1 - end]:
+                end += 1
+            ops.append({
+                'op': 'splice',
+                'key': key,
+                'start': start,
+                'delete': len(before) - start - end,
+                'insert': value[start:len(value) - end],
+            })
+        else:
+            ops.append({'op': 'set', 'key': key, 'value': value})
+    return ops
+
+
+def _apply_ops(data: Dict[str, Any], ops: List[Dict[str, Any]]) -> None:
+    for op in ops:
+        key = op['key']
+        if op['op'] == 'del':
+            data.pop(key, None)
+        elif op['op'] == 'set':
+            data[key] = op['value']
+        elif op['op'] == 'splice':
+            target = data.get(key)
+            if not isinstance(target, list):
+                target = []
+            start = op['start']
+            target[start:start + op['delete']] = op['insert']
+            data[key] = target
+        else:
+            raise ValueError(f"Unknown journal operation {op['op']!r}")
+
+
+def _replay_journal(slug: str, data: Dict[str, Any], *, strict: bool) -> Dict[str, Any]:
+    """Apply the uncompacted journal records for ``slug`` on top of ``data``."""
+    try:
+        raw = _journal_path(slug).read_bytes()
+    except FileNotFoundError:
+        return data
+    inc('keycoding_langdata_read_bytes_total', len(raw))
+    lines = raw.splitlines()
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            _apply_ops(data, json.loads(line)['ops'])
+        except (ValueError, KeyError, TypeError) as exc:
+            # Only a crash mid-append can leave a partial record, and it can
+            # only be the last one; anything earlier is real damage.
+            if number == len(lines):
+                logger.warning("Ignoring incomplete journal record for %s: %s", slug, exc)
+                break
+            if strict:
+                raise LanguageDataError(f"Journal for {slug} is corrupted and cannot be edited") from exc
+            logger.error("Corrupted journal record %d for %s: %s", number, slug, exc)
+    return data
+
+
+def atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Write ``payload`` to a temp file, fsync it and rename it over ``path``.
+
+    Readers see either the old or the new file, never a truncated one.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself.
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+@contextmanager
+def language_data_lock(slug: str) -> Iterator[float]:
+    """Hold an exclusive advisory lock on ``slug`` shared by every worker process.
+
+    Wrap a whole load-modify-save cycle in it so concurrent edits serialize
+    instead of overwriting each other. Yields the seconds spent waiting. The
+    lock is reentrant within a thread.
+    """
+    held = getattr(_held_locks, 'slugs', None)
+    if held is None:
+        held = _held_locks.slugs = set()
+    if slug in held:
+        yield 0.0
+        return
+
+    LANGDATA_DIR.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    contended = False
+    with open(LANGDATA_DIR / f".{slug}.lock", 'a+b') as fh:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                contended = True
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            fallback = None
+        else:
+            fallback = _fallback_locks.setdefault(slug, threading.Lock())
+            contended = not fallback.acquire(blocking=False)
+            if contended:
+                fallback.acquire()
+        waited = time.perf_counter() - started
+        _record_lock_wait(slug, waited, contended)
+        held.add(slug)
+        try:
+            yield waited
+        finally:
+            held.discard(slug)
+            if fallback is not None:
+                fallback.release()
+            else:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _record_lock_wait(slug: str, waited: float, contended: bool) -> None:
+    record_span('lock', waited)
+    observe('keycoding_langdata_lock_wait_seconds', waited)
+    with _lock_stats_lock:
+        _lock_stats['acquisitions'] += 1
+        _lock_stats['wait_total'] += waited
+        _lock_stats['wait_max'] = max(_lock_stats['wait_max'], waited)
+        if contended:
+            _lock_stats['contended'] += 1
+    if waited >= LANGDATA_LOCK_WARN_SECONDS:
+        logger.warning("Waited %.3fs for the %s language data lock", waited, slug)
+
+
+def language_lock_stats() -> Dict[str, float]:
+    """Return lock acquisition, contention and wait-time counters."""
+    with _lock_stats_lock:
+        return dict(_lock_stats)
+
+
+def _write_document(slug: str, data: Dict[str, Any]) -> None:
+    """Atomically rewrite the JSON file and drop the journal it supersedes."""
+    encoded = (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode('utf-8')
+    atomic_write_bytes(_langdata_path(slug), encoded)
+    inc('keycoding_langdata_written_bytes_total', len(encoded))
+    try:
+        _journal_path(slug).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _append_journal(slug: str, ops: List[Dict[str, Any]]) -> int:
+    """Append one compact record to the journal and return the journal size."""
+    record = json.dumps({'at': round(time.time(), 3), 'ops': ops}, ensure_ascii=False, separators=(',', ':'))
+    with open(_journal_path(slug), 'a+b') as fh:
+        if fh.seek(0, os.SEEK_END):
+            fh.seek(-1, os.SEEK_END)
+            if fh.read(1) != b"\n":
+                # A crash tore the previous append; drop it before writing.
+                fh.seek(0)
+                fh.truncate(fh.read().rfind(b"\n") + 1)
+        encoded = record.encode('utf-8') + b"\n"
+        fh.write(encoded)
+        inc('keycoding_langdata_written_bytes_total', len(encoded))
+        fh.flush()
+        os.fsync(fh.fileno())
+        return fh.tell()
 
 
-def _ensure_stdlib_entry(item: Any) -> Dict[str, Any]:
-    if isinstance(item, dict):
-        return {
-            'name': str(item.get('name', "")),
-            'description': str(item.get('description', "")),
+def save_language_data(slug: str, data: Dict[str, Any]) -> None:
+    """Persist the language JSON document back to disk.
+
+    The document is stored canonicalized and stamped with the schema
+    version (see keycoding.langschema). By default the whole document is
+    rewritten atomically. With LANGDATA_JOURNAL enabled only the difference
+    from the current document is appended to the journal, so write cost
+    follows the size of the edit.
+    """
+    # Canonicalizing also deep copies, so dumping has no side effects on
+    # ``data``, and stamps the document so readers can skip normalizing it.
+    with span('normalize'):
+        payload = canonicalize_document(data)
+    with language_data_lock(slug), span('write'):
+        current = get_language_data(slug) if LANGDATA_JOURNAL and _langdata_path(slug).exists() else None
+        if is_canonical(current):
+            # Journal records are replayed onto the file as stored, so only
+            # a stamped (canonical) file can take a diff; the first save of
+            # a legacy file rewrites it whole.
+            ops = _diff_documents(current, payload)
+            if ops:
+                size = _append_journal(slug, ops)
+                if size >= LANGDATA_JOURNAL_COMPACT_BYTES:
+                    compact_language_data(slug)
+        else:
+            _write_document(slug, payload)
+        invalidate_language_cache(slug)
+    with span('on-save'):
+        language_data_saved.send(sender=save_language_data, slug=slug, data=payload)
+
+
+def compact_language_data(slug: str) -> bool:
+    """Fold the journal for ``slug`` into a fresh JSON file.
+
+    Returns False when there was no journal to compact.
+    """
+    with language_data_lock(slug):
+        if not _journal_path(slug).exists():
+            return False
+        _write_document(slug, load_language_data(slug, strict=True))
+        invalidate_language_cache(slug)
+    return True
+
+
+def language_data_stamp(slug: str) -> Optional[Stamp]:
+    """Return a validator for the language's on-disk state, or None when missing."""
+    try:
+        stat = _langdata_path(slug).stat()
+    except FileNotFoundError:
+        return None
+    stamp: Stamp = (stat.st_mtime_ns, stat.st_size)
+    try:
+        journal = _journal_path(slug).stat()
+    except FileNotFoundError:
+        return stamp
+    return stamp + (journal.st_mtime_ns, journal.st_size)
+
+
+def get_language_data(slug: str) -> Dict[str, Any]:
+    """Return the normalized document for ``slug`` from the process-local cache.
+
+    Entries are revalidated against the file's mtime and size on every call,
+    so edits made by other processes are picked up. Misses are served from
+    the compiled snapshot when its entry still matches the file on disk, and
+    fall back to parsing and normalizing the JSON file otherwise. The returned
+    dict is shared between callers: copy it before mutating.
+    """
+    stamp = language_data_stamp(slug)
+    with _cache_lock:
+        entry = _cache.get(slug)
+        if entry is not None and entry[0] == stamp:
+            _cache.move_to_end(slug)
+            _cache_stats['hits'] += 1
+            inc('keycoding_langdata_cache_total', result='hit')
+            return entry[1]
+        _cache_stats['misses'] += 1
+    inc('keycoding_langdata_cache_total', result='miss')
+
+    data = _load_from_snapshot(slug, stamp)
+    if data is None:
+        data = load_normalized_language_data(slug)
+
+    with _cache_lock:
+        _cache[slug] = (stamp, data)
+        _cache.move_to_end(slug)
+        while len(_cache) > max(LANGDATA_CACHE_SIZE, 1):
+            _cache.popitem(last=False)
+            _cache_stats['evictions'] += 1
+    return data
+
+
+def invalidate_language_cache(slug: Optional[str] = None) -> None:
+    """Drop one cached language, or every cached language when slug is None."""
+    with _cache_lock:
+        if slug is None:
+            _cache_stats['invalidations'] += len(_cache)
+            _cache.clear()
+        elif _cache.pop(slug, None) is not None:
+            _cache_stats['invalidations'] += 1
+
+
+def language_cache_stats() -> Dict[str, int]:
+    """Return a snapshot of the cache counters plus its current size."""
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        stats['size'] = len(_cache)
+        stats['max_size'] = LANGDATA_CACHE_SIZE
+    return stats
+
+
+def build_language_snapshot(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Compile every langdata/*.json into one pre-normalized snapshot file.
+
+    Returns the snapshot index. The file is written next to the target and
+    renamed into place so running workers never map a half-written file.
+    """
+    target = Path(path) if path else _snapshot_path()
+    blobs: List[bytes] = []
+    index: Dict[str, Any] = {}
+    offset = 0
+    for slug in language_slugs():
+        stamp = language_data_stamp(slug)
+        doc = load_normalized_language_data(slug)
+        blob = json.dumps(doc, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        index[slug] = {
+            'offset': offset,
+            'length': len(blob),
+            'stamp': list(stamp or ()),
+            'summary': summarize_language_data(doc),
         }
-    return {'name': str(item), 'description': ""}
+        blobs.append(blob)
+        offset += len(blob)
+
+    # Offsets are relative to the end of the index so the index can be
+    # serialized before its own size is known.
+    index_blob = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, len(index_blob))
+    atomic_write_bytes(target, b''.join([header, index_blob, *blobs]))
+    return index
+
+
+def _open_snapshot() -> Optional[Tuple[mmap.mmap, Dict[str, Any], int]]:
+    """Map the snapshot file, reusing the current mapping while it is unchanged."""
+    global _snapshot
+    path = _snapshot_path()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        with _snapshot_lock:
+            _snapshot = None
+        return None
+    identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _snapshot_lock:
+        if _snapshot is not None and _snapshot[0] == identity:
+            return _snapshot[1], _snapshot[2], _snapshot[3]
+        if stat.st_size < _SNAPSHOT_HEADER.size:
+            _snapshot = None
+            return None
+        with open(path, 'rb') as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = _SNAPSHOT_HEADER.unpack_from(mapped, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT:
+            mapped.close()
+            _snapshot = None
+            return None
+        start = _SNAPSHOT_HEADER.size
+        try:
+            index = json.loads(mapped[start:start + index_length])
+        except ValueError:
+            mapped.close()
+            _snapshot = None
+            return None
+        _snapshot = (identity, mapped, index, start + index_length)
+        return mapped, index, start + index_length
+
+
+def _load_from_snapshot(slug: str, stamp: Optional[Stamp]) -> Optional[Dict[str, Any]]:
+    """Decode one language from the snapshot if its entry matches ``stamp``."""
+    if stamp is None:
+        return None
+    opened = _open_snapshot()
+    if opened is None:
+        return None
+    mapped, index, base = opened
+    entry = index.get(slug)
+    if not isinstance(entry, dict):
+        return None
+    if tuple(entry.get('stamp') or ()) != stamp:
+        # The JSON file was saved after the snapshot was built.
+        _snapshot_stats['stale'] += 1
+        return None
+    start = base + entry['offset']
+    try:
+        with span('snapshot'):
+            data = json.loads(mapped[start:start + entry['length']])
+    except ValueError:
+        return None
+    _snapshot_stats['hits'] += 1
+    return data
+
+
+def snapshot_language_summary(slug: str, stamp: Optional[Stamp]) -> Optional[Dict[str, Any]]:
+    """Return the summary stored in the snapshot index if it matches ``stamp``.
+
+    Only the index is read; the language blob is not decoded.
+    """
+    if stamp is None:
+        return None
+    opened = _open_snapshot()
+    if opened is None:
+        return None
+    entry = opened[1].get(slug)
+    if not isinstance(entry, dict) or tuple(entry.get('stamp') or ()) != stamp:
+        return None
+    summary = entry.get('summary')
+    return summary if isinstance(summary, dict) else None
+
+
+def language_snapshot_stats() -> Dict[str, Any]:
+    """Return snapshot hit/stale counters and whether a snapshot is mapped."""
+    stats: Dict[str, Any] = dict(_snapshot_stats)
+    with _snapshot_lock:
+        stats['loaded'] = _snapshot is not None
+        stats['languages'] = len(_snapshot[2]) if _snapshot is not None else 0
+    return stats
 
 
 def normalize_language_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """Return a deep-copied, normalized language document."""
-    doc = deepcopy(data) if isinstance(data, dict) else {}
-    doc.setdefault('name', '')
-    doc.setdefault('slug', '')
-    doc.setdefault('version', '')
-
-    doc['quick_start'] = [_ensure_quick_start(item) for item in doc.get('quick_start', []) or []]
-    doc['concepts'] = [_ensure_concept(item) for item in doc.get('concepts', []) or []]
-    doc['common_tasks'] = [_ensure_task_group(group) for group in doc.get('common_tasks', []) or []]
-    doc['projects'] = [_ensure_project(item) for item in doc.get('projects', []) or []]
-    doc['glossary'] = [_ensure_glossary_entry(item) for item in doc.get('glossary', []) or []]
-    doc['tips'] = [_ensure_tip(item) for item in doc.get('tips', []) or []]
-    doc['tools'] = [_ensure_tool(item) for item in doc.get('tools', []) or []]
-    doc['links'] = [_ensure_link(item) for item in doc.get('links', []) or []]
-    doc['builtins'] = [_ensure_builtin(item) for item in doc.get('builtins', []) or []]
-    doc['stdlib'] = [_ensure_stdlib_entry(item) for item in doc.get('stdlib', []) or []]
-
-    return doc
+    with span('normalize'):
+        return normalize_document(data)
+
+
+def load_normalized_language_data(slug: str, *, strict: bool = False) -> Dict[str, Any]:
+    """Load ``slug`` in normalized form, as a fresh document the caller owns.
+
+    Files stamped with the current schema version were canonicalized when
+    they were written and are returned as parsed; only unstamped (legacy)
+    files go through normalize_language_data.
+    """
+    data = load_language_data(slug, strict=strict)
+    if is_canonical(data):
+        inc('keycoding_langdata_normalize_total', result='skipped')
+        return data
+    inc('keycoding_langdata_normalize_total', result='normalized')
+    return normalize_language_data(data)
+
+
+SUMMARY_SECTIONS = (
+    'quick_start',
+    'concepts',
+    'common_tasks',
+    'projects',
+    'glossary',
+    'tips',
+    'builtins',
+    'stdlib',
+    'tools',
+    'links',
+)
+
+
+def summarize_language_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the name, version and per-section entry counts of a document."""
+    counts = {}
+    for section in SUMMARY_SECTIONS:
+        entries = data.get(section) or []
+        if section == 'common_tasks':
+            counts[section] = sum(len(group.get('tasks') or []) for group in entries if isinstance(group, dict))
+        else:
+            counts[section] = len(entries)
+    return {
+        'name': data.get('name') or '',
+        'version': data.get('version') or '',
+        'counts': counts,
+        'entries': sum(counts.values()),
+    }
 
 
 __all__ = [
     'load_language_data',
     'save_language_data',
     'normalize_language_data',
+    'load_normalized_language_data',
+    'get_language_data',
+    'invalidate_language_cache',
+    'language_cache_stats',
+    'language_data_stamp',
+    'language_slugs',
+    'build_language_snapshot',
+    'language_snapshot_stats',
+    'snapshot_language_summary',
+    'summarize_language_data',
+    'language_data_saved',
+    'language_data_lock',
+    'language_lock_stats',
+    'LanguageDataError',
+    'atomic_write_bytes',
+    'compact_language_data',
 ]
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any, Dict, List
+
+# The shape every language document is normalized to. This module has no
+# Django dependency so scripts/normalize_langdata.py and its pool workers
+# apply exactly the rules keycoding.langdata uses at runtime.
+#
+# With ``keep_extra`` the canonical fields come first and any other keys of a
+# dict entry are kept after them (the runtime drops them); that is how the
+# normalizer rewrites files without losing data such as builtins' category.
+#
+# Documents written by canonicalize_document() carry SCHEMA_KEY =
+# SCHEMA_VERSION, and readers use them as they are instead of normalizing
+# them again. Bump SCHEMA_VERSION whenever a rule below changes, so that
+# documents stamped under the old rules take the normalizing path again
+# until they are rewritten.
+SCHEMA_KEY = '_schema'
+SCHEMA_VERSION = 1
+
+
+def _keep_extra(original: Any, normalized: Any) -> None:
+    # Copy keys the schema dropped back onto the normalized entry, recursing
+    # into nested lists (tasks, steps), which normalize one-to-one.
+    if not (isinstance(original, dict) and isinstance(normalized, dict)):
+        return
+    for key, value in original.items():
+        if key not in normalized:
+            normalized[key] = value
+        elif isinstance(value, list) and isinstance(normalized[key], list):
+            for before, after in zip(value, normalized[key]):
+                _keep_extra(before, after)
+
+
+def _ensure_task(task: Any) -> Dict[str, Any]:
+    if isinstance(task, dict):
+        return {
+            'title': str(task.get('title', "")),
+            'description': str(task.get('description', "")),
+            'code': str(task.get('code', "")),
+        }
+    return {'title': "", 'description': "", 'code': ""}
+
+
+def _ensure_task_group(group: Any) -> Dict[str, Any]:
+    name = ""
+    tasks: List[Any] = []
+    if isinstance(group, dict):
+        name = str(group.get('group', ""))
+        tasks = group.get('tasks', []) or []
+    return {
+        'group': name,
+        'tasks': [_ensure_task(t) for t in tasks],
+    }
+
+
+def _ensure_project_step(step: Any) -> Dict[str, Any]:
+    if isinstance(step, dict):
+        return {
+            'title': str(step.get('title', "")),
+            'text': str(step.get('text', "")),
+            'code': str(step.get('code', "")),
+        }
+    return {'title': "", 'text': "", 'code': ""}
+
+
+def _ensure_project(project: Any) -> Dict[str, Any]:
+    if isinstance(project, dict):
+        return {
+            'title': str(project.get('title', "")),
+            'summary': str(project.get('summary', "")),
+            'description': str(project.get('description', "")),
+            'steps': [_ensure_project_step(s) for s in project.get('steps', []) or []],
+        }
+    return {'title': "", 'summary': "", 'description': "", 'steps': []}
+
+
+def _ensure_concept(concept: Any) -> Dict[str, Any]:
+    if isinstance(concept, dict):
+        return {
+            'id': str(concept.get('id', "")),
+            'title': str(concept.get('title', "")),
+            'tag': str(concept.get('tag', "")),
+            'description': str(concept.get('description', "")),
+            'code': str(concept.get('code', "")),
+        }
+    return {'id': "", 'title': "", 'tag': "", 'description': "", 'code': ""}
+
+
+def _ensure_quick_start(item: Any) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return {
+            'title': str(item.get('title', "")),
+            'description': str(item.get('description', "")),
+            'code': str(item.get('code', "")),
+        }
+    return {'title': "", 'description': "", 'code': ""}
+
+
+def _ensure_glossary_entry(item: Any) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return {
+            'term': str(item.get('term', "")),
+            'definition': str(item.get('definition', "")),
+        }
+    return {'term': "", 'definition': ""}
+
+
+def _ensure_tip(item: Any) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return {
+            'title': str(item.get('title', "")),
+            'note': str(item.get('note', item.get('text', ""))),
+        }
+    return {'title': "", 'note': str(item)}
+
+
+def _ensure_tool(item: Any) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return {
+            'name': str(item.get('name', item.get('title', ""))),
+            'description': str(item.get('description', "")),
+        }
+    return {'name': str(item), 'description': ""}
+
+
+def _ensure_link(item: Any) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return {
+            'title': str(item.get('title', "")),
+            'url': str(item.get('url', "")),
+            'description': str(item.get('description', "")),
+        }
+    return {'title': str(item), 'url': "", 'description': ""}
+
+
+def _ensure_builtin(item: Any) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return {
+            'name': str(item.get('name', "")),
+            'kind': str(item.get('kind', "")),
+            'signature': str(item.get('signature', "")),
+            'description': str(item.get('description', "")),
+        }
+    return {'name': "", 'kind': "", 'signature': "", 'description': ""}
+
+
+def _ensure_stdlib_entry(item: Any) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return {
+            'name': str(item.get('name', "")),
+            'description': str(item.get('description', "")),
+        }
+    return {'name': str(item), 'description': ""}
+
+
+# Section -> entry normalizer, in document order.
+SECTION_RULES = {
+    'quick_start': _ensure_quick_start,
+    'concepts': _ensure_concept,
+    'common_tasks': _ensure_task_group,
+    'projects': _ensure_project,
+    'glossary': _ensure_glossary_entry,
+    'tips': _ensure_tip,
+    'tools': _ensure_tool,
+    'links': _ensure_link,
+    'builtins': _ensure_builtin,
+    'stdlib': _ensure_stdlib_entry,
+}
+
+
+def normalize_document(data: Dict[str, Any], *, keep_extra: bool = False) -> Dict[str, Any]:
+    """Return a deep-copied language document in the canonical shape."""
+    doc = deepcopy(data) if isinstance(data, dict) else {}
+    doc.setdefault('name', '')
+    doc.setdefault('slug', '')
+    doc.setdefault('version', '')
+    for section, ensure in SECTION_RULES.items():
+        entries = doc.get(section, []) or []
+        doc[section] = [ensure(item) for item in entries]
+        if keep_extra:
+            for before, after in zip(entries, doc[section]):
+                _keep_extra(before, after)
+    return doc
+
+
+def canonicalize_document(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize ``data`` for storage, keeping unknown keys, and stamp it."""
+    doc = normalize_document(data, keep_extra=True)
+    doc[SCHEMA_KEY] = SCHEMA_VERSION
+    return doc
+
+
+def is_canonical(data: Any) -> bool:
+    """True when ``data`` was stamped by canonicalize_document under the current rules."""
+    return isinstance(data, dict) and data.get(SCHEMA_KEY) == SCHEMA_VERSION
+
+
+__all__ = [
+    'SCHEMA_KEY',
+    'SCHEMA_VERSION',
+    'SECTION_RULES',
+    'canonicalize_document',
+    'is_canonical',
+    'normalize_document',
+]
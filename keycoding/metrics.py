@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import atexit
+import bisect
+import json
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+# Every server process keeps its own counters in memory and periodically dumps
+# them to METRICS_DIR/<pid>-<token>.json; the endpoint sums the files of all
+# workers. Only processes that serve requests (those that build
+# MetricsMiddleware) write files, so management commands and scripts leave
+# nothing behind. Each serving process holds an flock on its <name>.lock for
+# as long as it lives; when a scrape finds a file whose lock is free, the
+# process has exited, and its totals are folded into retired.json and the file
+# removed, so counters never go backwards and the directory does not grow.
+METRICS_DIR = Path(getattr(settings, 'METRICS_DIR', Path(settings.BASE_DIR) / '.metrics'))
+METRICS_FLUSH_SECONDS = getattr(settings, 'METRICS_FLUSH_SECONDS', 1.0)
+RETIRED_NAME = 'retired.json'
+GUARD_NAME = 'retire.guard'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOCK_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# name -> (type, help, label names, histogram buckets)
+METRICS: Dict[str, Tuple[str, str, Tuple[str, ...], Tuple[float, ...]]] = {
+    'keycoding_request_duration_seconds': (
+        'histogram', 'Request latency by URL name.', ('view', 'method'), LATENCY_BUCKETS,
+    ),
+    'keycoding_langdata_cache_total': (
+        'counter', 'Language data cache lookups by result.', ('result',), (),
+    ),
+    'keycoding_langdata_read_bytes_total': (
+        'counter', 'Bytes read from language JSON files and journals.', (), (),
+    ),
+    'keycoding_langdata_written_bytes_total': (
+        'counter', 'Bytes written to language JSON files and journals.', (), (),
+    ),
+    'keycoding_langdata_normalize_total': (
+        'counter', 'Language documents loaded, by whether normalization was skipped.', ('result',), (),
+    ),
+    'keycoding_langdata_lock_wait_seconds': (
+        'histogram', 'Time spent waiting for a language data lock.', (), LOCK_WAIT_BUCKETS,
+    ),
+    'keycoding_db_lock_wait_seconds': (
+        'histogram', 'Time spent waiting for the SQLite write lock at BEGIN.', (), LOCK_WAIT_BUCKETS,
+    ),
+    'keycoding_db_locked_errors_total': (
+        'counter', 'Statements that failed with "database is locked".', (), (),
+    ),
+    'keycoding_language_actions_total': (
+        'counter', 'Language edit actions applied, by action and outcome.', ('action', 'outcome'), (),
+    ),
+}
+
+Labels = Tuple[str, ...]
+
+# (name, label values) -> value, and -> [bucket counts..., sum, count]
+_counters: Dict[Tuple[str, Labels], float] = {}
+_histograms: Dict[Tuple[str, Labels], List[float]] = {}
+_lock = threading.Lock()
+_last_flush = 0.0
+# (file stem, lock file descriptor) once this process serves requests
+_owner: Optional[Tuple[str, Optional[int]]] = None
+
+
+def _labels(name: str, labels: Dict[str, str]) -> Labels:
+    return tuple(str(labels.get(label, '')) for label in METRICS[name][2])
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    """Increase counter ``name`` by ``amount``."""
+    key = (name, _labels(name, labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """Record ``value`` in histogram ``name``."""
+    buckets = METRICS[name][3]
+    key = (name, _labels(name, labels))
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [0.0] * (len(buckets) + 2)
+        position = bisect.bisect_left(buckets, value)
+        if position < len(buckets):
+            entry[position] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+
+def _state() -> Dict[str, Any]:
+    with _lock:
+        return {
+            'counters': [[name, list(labels), value] for (name, labels), value in _counters.items()],
+            'histograms': [[name, list(labels), list(entry)] for (name, labels), entry in _histograms.items()],
+        }
+
+
+def _claim_lock(stem: str) -> Optional[int]:
+    # The lock file is locked before it gets its final name, so a scrape
+    # never sees it unlocked while this process is alive.
+    if fcntl is None:
+        return None
+    fd, tmp = tempfile.mkstemp(prefix='.lock.', dir=METRICS_DIR)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    os.replace(tmp, METRICS_DIR / f'{stem}.lock')
+    return fd
+
+
+def start() -> None:
+    """Give this process a metrics file of its own; called when it starts serving."""
+    global _owner
+    if _owner is not None:
+        return
+    stem = f'{os.getpid()}-{secrets.token_hex(4)}'
+    fd = None
+    try:
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        fd = _claim_lock(stem)
+    except OSError as exc:
+        logger.warning("Could not lock metrics file in %s: %s", METRICS_DIR, exc)
+    _owner = (stem, fd)
+
+
+def _after_fork() -> None:
+    # The inherited counters and file belong to the parent (e.g. a preloading
+    # master); a serving child starts from zero under a file of its own.
+    global _owner, _last_flush
+    owner = _owner
+    _owner = None
+    _last_flush = 0.0
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+    if owner is not None:
+        if owner[1] is not None:
+            os.close(owner[1])
+        start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _own_name() -> str:
+    return f'{_owner[0]}.json' if _owner is not None else ''
+
+
+def flush(force: bool = False) -> None:
+    """Write this process's counters to its file, at most every METRICS_FLUSH_SECONDS.
+
+    Does nothing in processes that never called start().
+    """
+    global _last_flush
+    if _owner is None:
+        return
+    now = time.monotonic()
+    if not force and now - _last_flush < METRICS_FLUSH_SECONDS:
+        return
+    _last_flush = now
+    payload = json.dumps(_state(), separators=(',', ':')).encode('utf-8')
+    try:
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix='.metrics.', suffix='.tmp', dir=METRICS_DIR)
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(payload)
+        os.replace(tmp, METRICS_DIR / _own_name())
+    except OSError as exc:
+        logger.warning("Could not write metrics to %s: %s", METRICS_DIR, exc)
+
+
+atexit.register(flush, True)
+
+
+def _sum(states: Iterable[Dict[str, Any]]) -> Tuple[Dict[Tuple[str, Labels], float], Dict[Tuple[str, Labels], List[float]]]:
+    counters: Dict[Tuple[str, Labels], float] = {}
+    histograms: Dict[Tuple[str, Labels], List[float]] = {}
+    for state in states:
+        for name, labels, value in state.get('counters', []):
+            key = (name, tuple(labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, entry in state.get('histograms', []):
+            key = (name, tuple(labels))
+            total = histograms.get(key)
+            if total is None or len(total) != len(entry):
+                histograms[key] = list(entry)
+            else:
+                histograms[key] = [a + b for a, b in zip(total, entry)]
+    return counters, histograms
+
+
+def _read_state(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _has_exited(stem: str) -> bool:
+    # The owner holds the lock until it exits. Files without a lock file were
+    # written before lock files existed.
+    try:
+        fd = os.open(METRICS_DIR / f'{stem}.lock', os.O_RDWR)
+    except FileNotFoundError:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def _retire_exited() -> None:
+    """Fold the files of exited processes into RETIRED_NAME and delete them.
+
+    Runs under the guard lock. Names folded in are recorded in the retired
+    file until they are deleted, so a crash between the two steps cannot
+    count a file twice.
+    """
+    own = _owner[0] if _owner is not None else None
+    stems = {path.stem for pattern in ('*.json', '*.lock') for path in METRICS_DIR.glob(pattern)}
+    stems.discard(Path(RETIRED_NAME).stem)
+    stems.discard(own)
+    exited = sorted(stem for stem in stems if _has_exited(stem))
+    if not exited:
+        return
+    retired_path = METRICS_DIR / RETIRED_NAME
+    retired = _read_state(retired_path) or {}
+    merged = set(retired.get('merged', []))
+    states = [retired]
+    for stem in exited:
+        if stem not in merged:
+            state = _read_state(METRICS_DIR / f'{stem}.json')
+            if state is not None:
+                states.append(state)
+    counters, histograms = _sum(states)
+    payload = {
+        'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, list(labels), entry] for (name, labels), entry in histograms.items()],
+        'merged': exited,
+    }
+    fd, tmp = tempfile.mkstemp(prefix='.metrics.', suffix='.tmp', dir=METRICS_DIR)
+    with os.fdopen(fd, 'wb') as fh:
+        fh.write(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+    os.replace(tmp, retired_path)
+    for stem in exited:
+        for suffix in ('.json', '.lock'):
+            try:
+                os.unlink(METRICS_DIR / f'{stem}{suffix}')
+            except FileNotFoundError:
+                pass
+
+
+@contextmanager
+def _guard() -> Iterator[None]:
+    # Serializes scrapes, so no file is read while another scrape retires it.
+    if fcntl is None:
+        yield
+        return
+    with open(METRICS_DIR / GUARD_NAME, 'a+b') as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _collect() -> Tuple[Dict[Tuple[str, Labels], float], Dict[Tuple[str, Labels], List[float]]]:
+    """Sum the files of every other worker with this process's live counters."""
+    states = [_state()]
+    if not METRICS_DIR.is_dir():
+        return _sum(states)
+    own = _own_name()
+    with _guard():
+        if fcntl is not None:
+            try:
+                _retire_exited()
+            except OSError as exc:
+                logger.warning("Could not retire metrics files in %s: %s", METRICS_DIR, exc)
+        for path in sorted(METRICS_DIR.glob('*.json')):
+            if path.name == own:
+                continue
+            state = _read_state(path)
+            if state is not None:
+                states.append(state)
+    return _sum(states)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_metrics() -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    counters, histograms = _collect()
+    lines: List[str] = []
+    for name, (kind, help_text, label_names, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(label_names, labels)} {_number(value)}')
+            continue
+        for (metric, labels), entry in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0.0
+            for bound, count in zip(buckets, entry):
+                cumulative += count
+                le = _format_labels(label_names, labels, f'le="{bound}"')
+                lines.append(f'{name}_bucket{le} {_number(cumulative)}')
+            le = _format_labels(label_names, labels, 'le="+Inf"')
+            lines.append(f'{name}_bucket{le} {_number(entry[-1])}')
+            lines.append(f'{name}_sum{_format_labels(label_names, labels)} {repr(float(entry[-2]))}')
+            lines.append(f'{name}_count{_format_labels(label_names, labels)} {_number(entry[-1])}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Record request latency per URL name and flush counters to disk."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        start()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            observe(
+                'keycoding_request_duration_seconds',
+                time.perf_counter() - start,
+                view=match.view_name or match._func_path,
+                method=request.method,
+            )
+        flush()
+        return response
+
+
+__all__ = [
+    'METRICS',
+    'MetricsMiddleware',
+    'inc',
+    'observe',
+    'flush',
+    'render_metrics',
+    'start',
+]
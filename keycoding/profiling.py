@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse
+
+
+PROFILE_DIR = Path(getattr(settings, 'PROFILE_DIR', Path(settings.BASE_DIR) / '.profiles'))
+PROFILE_INTERVAL = getattr(settings, 'PROFILE_INTERVAL', 0.001)
+PROFILE_TOP = getattr(settings, 'PROFILE_TOP', 30)
+
+# Sampling changes the interpreter's switch interval, which is process wide,
+# so only one request is profiled at a time.
+_profile_lock = threading.Lock()
+_labels: Dict[object, str] = {}
+_THIS_FILE = __file__
+_roots = tuple(sorted({str(settings.BASE_DIR), *(p for p in sys.path if p)}, key=len, reverse=True))
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for root in _roots:
+            if filename.startswith(root + os.sep):
+                filename = filename[len(root) + 1:]
+                break
+        label = _labels[code] = f'{code.co_name} ({filename}:{code.co_firstlineno})'
+    return label
+
+
+class _Sampler(threading.Thread):
+    """Record the stack of ``thread_id`` every ``interval`` seconds.
+
+    Frames above ``stop_code`` (the server and outer middleware) are left out.
+    """
+
+    def __init__(self, thread_id: int, stop_code, interval: float):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.stop_code = stop_code
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None and frame.f_code is not self.stop_code:
+                if frame.f_code.co_filename == _THIS_FILE:
+                    # The request thread is in stop() (or its join()): the
+                    # view has returned, and this is the profiler itself.
+                    stack = []
+                    break
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            if stack and not self._done.is_set():
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        # Set first, so a sample taken while this thread waits in join() is
+        # dropped rather than recorded.
+        self._done.set()
+        self.join()
+
+
+def collapsed_stacks(stacks: Counter) -> str:
+    """Format stacks as ``frame;frame;frame count`` lines for flamegraph tools."""
+    return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+
+
+def top_functions(stacks: Counter, limit: int = PROFILE_TOP) -> List[Tuple[str, int, int]]:
+    """Return ``(function, self samples, total samples)`` for the hottest functions."""
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    ranked = sorted(total, key=lambda name: (own[name], total[name]), reverse=True)[:limit]
+    return [(name, own[name], total[name]) for name in ranked]
+
+
+def _summary(request, stacks: Counter, elapsed: float) -> str:
+    samples = sum(stacks.values())
+    lines = [
+        f'{request.method} {request.get_full_path()}: {samples} samples over {elapsed * 1000:.1f}ms',
+        '',
+        f'{"self%":>7} {"total%":>7}  function',
+    ]
+    for name, own, total in top_functions(stacks):
+        lines.append(f'{own * 100 / max(samples, 1):>6.1f}% {total * 100 / max(samples, 1):>6.1f}%  {name}')
+    return '\n'.join(lines) + '\n'
+
+
+def _store(request, collapsed: str, summary: str) -> Optional[str]:
+    match = getattr(request, 'resolver_match', None)
+    view = re.sub(r'[^A-Za-z0-9_.-]+', '-', (match.view_name if match else '') or 'request')
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{view}"
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        (PROFILE_DIR / f'{profile_id}.collapsed').write_text(collapsed, encoding='utf-8')
+        (PROFILE_DIR / f'{profile_id}.txt').write_text(summary, encoding='utf-8')
+    except OSError:
+        return None
+    return profile_id
+
+
+class ProfilerMiddleware:
+    """Sample one request when a superuser asks for it.
+
+    Send ``?_profile=1`` (or an ``X-Profile: 1`` header) to store the collapsed
+    stacks and a top-functions summary in PROFILE_DIR, ``top`` to get the
+    summary instead of the page, or ``collapsed`` to get the stacks. Install
+    it after AuthenticationMiddleware; other requests only pay for the lookup.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = request.GET.get('_profile') or request.headers.get('X-Profile')
+        if not mode or not request.user.is_superuser:
+            return self.get_response(request)
+        if not _profile_lock.acquire(blocking=False):
+            response = self.get_response(request)
+            response['X-Profile'] = 'busy'
+            return response
+        switch_interval = sys.getswitchinterval()
+        try:
+            # The sampler only runs when the request thread yields the GIL.
+            sys.setswitchinterval(min(switch_interval, PROFILE_INTERVAL / 2))
+            sampler = _Sampler(threading.get_ident(), self.__call__.__code__, PROFILE_INTERVAL)
+            start = time.perf_counter()
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+            elapsed = time.perf_counter() - start
+        finally:
+            sys.setswitchinterval(switch_interval)
+            _profile_lock.release()
+
+        collapsed = collapsed_stacks(sampler.stacks)
+        summary = _summary(request, sampler.stacks, elapsed)
+        if mode == 'collapsed':
+            return HttpResponse(collapsed, content_type='text/plain; charset=utf-8')
+        if mode == 'top':
+            return HttpResponse(summary, content_type='text/plain; charset=utf-8')
+        profile_id = _store(request, collapsed, summary)
+        if profile_id:
+            response['X-Profile'] = profile_id
+        return response
+
+
+__all__ = [
+    'ProfilerMiddleware',
+    'collapsed_stacks',
+    'top_functions',
+]
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.utils.text import slugify
+
+from . import langdata
+from .langdata import (
+    atomic_write_bytes,
+    get_language_data,
+    language_data_saved,
+    language_data_stamp,
+    language_slugs,
+)
+
+
+INDEX_FORMAT = 1
+SNIPPET_LENGTH = 160
+TITLE_WEIGHT = 3
+
+# BM25 parameters.
+_K1 = 1.2
+_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9_+#]+")
+_STOPWORDS = frozenset(
+    'a an and are as at be by for from how i in into is it of on or the this to with'.split()
+)
+
+# In-memory copy of the persisted index plus the identity of the file it was
+# read from, so indexes written by other workers are picked up.
+_index: Optional[Dict[str, Any]] = None
+_index_identity: Optional[Tuple[int, int]] = None
+_index_lock = threading.RLock()
+
+
+def _index_path() -> Path:
+    configured = getattr(settings, 'SEARCH_INDEX_PATH', None)
+    return Path(configured) if configured else langdata.LANGDATA_DIR / '.search_index'
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ``text`` and split it into index terms."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        # Fold simple plurals so "files" matches "file".
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _snippet(text: str) -> str:
+    text = ' '.join(text.split())
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rsplit(' ', 1)[0] + '…'
+
+
+def _iter_documents(doc: Dict[str, Any]) -> Iterator[Tuple[str, str, str, str, str]]:
+    """Yield ``(section, title, context, body, anchor)`` for every searchable entry.
+
+    ``context`` is indexed but not shown; ``body`` also provides the snippet.
+    """
+    for item in doc.get('concepts', []):
+        yield 'concepts', item.get('title', ''), item.get('tag', ''), item.get('description', ''), f"concept-{item.get('id', '')}"
+    for group in doc.get('common_tasks', []):
+        for task in group.get('tasks', []):
+            yield 'common_tasks', task.get('title', ''), group.get('group', ''), task.get('description', ''), f"task-{slugify(task.get('title', ''))}"
+    for item in doc.get('projects', []):
+        yield 'projects', item.get('title', ''), item.get('summary', ''), item.get('description', ''), f"project-{slugify(item.get('title', ''))}"
+    for item in doc.get('glossary', []):
+        yield 'glossary', item.get('term', ''), '', item.get('definition', ''), ''
+    for item in doc.get('tips', []):
+        yield 'tips', item.get('title', ''), '', item.get('note', ''), ''
+    for item in doc.get('builtins', []):
+        yield 'builtins', item.get('name', ''), f"{item.get('kind', '')} {item.get('signature', '')}", item.get('description', ''), ''
+
+
+def _index_language(index: Dict[str, Any], slug: str) -> None:
+    """(Re)index a single language in place."""
+    _drop_language(index, slug)
+    doc = get_language_data(slug)
+    postings = index['postings']
+    docs: List[List[Any]] = []
+    terms = set()
+    for section, title, context, body, anchor in _iter_documents(doc):
+        weights: Counter = Counter()
+        for token in tokenize(title):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(f"{context} {body}"):
+            weights[token] += 1
+        if not weights:
+            continue
+        doc_id = len(docs)
+        docs.append([section, title, _snippet(body), anchor, sum(weights.values())])
+        for token, weight in weights.items():
+            postings.setdefault(token, {}).setdefault(slug, []).append([doc_id, weight])
+            terms.add(token)
+    index['languages'][slug] = {
+        'name': doc.get('name') or slug,
+        'stamp': list(language_data_stamp(slug) or ()),
+        'docs': docs,
+        'doc_length': sum(entry[4] for entry in docs),
+        'terms': sorted(terms),
+    }
+
+
+def _drop_language(index: Dict[str, Any], slug: str) -> None:
+    entry = index['languages'].pop(slug, None)
+    if entry is None:
+        return
+    postings = index['postings']
+    for token in entry['terms']:
+        by_lang = postings.get(token)
+        if by_lang is None:
+            continue
+        by_lang.pop(slug, None)
+        if not by_lang:
+            del postings[token]
+
+
+def _refresh_stale(index: Dict[str, Any]) -> bool:
+    """Reindex languages whose file changed since they were indexed."""
+    on_disk = set(language_slugs())
+    changed = False
+    for slug in set(index['languages']) - on_disk:
+        _drop_language(index, slug)
+        changed = True
+    for slug in sorted(on_disk):
+        entry = index['languages'].get(slug)
+        if entry is None or tuple(entry['stamp']) != language_data_stamp(slug):
+            _index_language(index, slug)
+            changed = True
+    return changed
+
+
+def _save_index(index: Dict[str, Any]) -> None:
+    global _index_identity
+    path = _index_path()
+    atomic_write_bytes(path, json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    stat = path.stat()
+    _index_identity = (stat.st_mtime_ns, stat.st_size)
+
+
+def get_search_index() -> Dict[str, Any]:
+    """Return the search index, loading, building or refreshing it as needed."""
+    global _index, _index_identity
+    path = _index_path()
+    with _index_lock:
+        try:
+            stat = path.stat()
+            identity: Optional[Tuple[int, int]] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            identity = None
+        if _index is None or (identity is not None and identity != _index_identity):
+            loaded = None
+            if identity is not None:
+                try:
+                    loaded = json.loads(path.read_text(encoding='utf-8'))
+                except ValueError:
+                    loaded = None
+            if not isinstance(loaded, dict) or loaded.get('format') != INDEX_FORMAT:
+                loaded = {'format': INDEX_FORMAT, 'languages': {}, 'postings': {}}
+            _index = loaded
+            _index_identity = identity
+        if _refresh_stale(_index):
+            _save_index(_index)
+        return _index
+
+
+def update_language_index(slug: str) -> None:
+    """Reindex one language and persist the index without rescanning the corpus."""
+    with _index_lock:
+        if _index is None and not _index_path().exists():
+            # Nothing built yet; the first search builds the full index.
+            return
+        # Refreshing compares stamps, so only the saved language is reindexed.
+        get_search_index()
+
+
+@receiver(language_data_saved)
+def _reindex_saved_language(sender, slug, **kwargs):
+    update_language_index(slug)
+
+
+def search(query: str, *, limit: int = 50) -> List[Dict[str, Any]]:
+    """Rank indexed entries across every language for ``query`` using BM25."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    index = get_search_index()
+    with _index_lock:
+        languages = index['languages']
+        total_docs = sum(len(entry['docs']) for entry in languages.values())
+        if not total_docs:
+            return []
+        avg_length = sum(entry['doc_length'] for entry in languages.values()) / total_docs
+        scores: Dict[Tuple[str, int], float] = {}
+        for term in terms:
+            by_lang = index['postings'].get(term)
+            if not by_lang:
+                continue
+            df = sum(len(hits) for hits in by_lang.values())
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for slug, hits in by_lang.items():
+                docs = languages[slug]['docs']
+                for doc_id, tf in hits:
+                    norm = _K1 * (1 - _B + _B * docs[doc_id][4] / avg_length)
+                    key = (slug, doc_id)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        results = []
+        for (slug, doc_id), score in ranked:
+            section, title, snippet, anchor, _length = languages[slug]['docs'][doc_id]
+            results.append({
+                'slug': slug,
+                'language': languages[slug]['name'],
+                'section': section,
+                'title': title,
+                'snippet': snippet,
+                'anchor': anchor,
+                'score': round(score, 3),
+            })
+    return results
+
+
+__all__ = [
+    'tokenize',
+    'get_search_index',
+    'update_language_index',
+    'search',
+]
@@ -1,4 +1,5 @@
 from pathlib import Path
+import hashlib
 import os
 
 
@@ -25,11 +26,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so session and auth queries are part of the timed request.
+    'keycoding.timing.ServerTimingMiddleware',
+    'keycoding.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Superuser-only ?_profile=1 sampling; needs request.user
+    'keycoding.profiling.ProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -56,8 +62,16 @@ WSGI_APPLICATION = 'keycoding.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # django.db.backends.sqlite3 plus WAL, pragmas and lock-wait stats
+        'ENGINE': 'keycoding.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep each worker thread's connection (and its page cache) between
+        # requests instead of reconnecting every time
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+        },
     }
 }
 
@@ -91,6 +105,10 @@ STATICFILES_DIRS = [BASE_DIR / 'static'] if (BASE_DIR / 'static').exists() else
 # Media (user uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Avatars are streamed to disk, capped at this size and stored with
+# AVATAR_SIZES thumbnails (Pillow required) under their content hash
+AVATAR_MAX_BYTES = 2 * 1024 * 1024
+AVATAR_SIZES = (64, 128, 256)
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -98,5 +116,65 @@ LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'home'
 LOGIN_URL = 'login'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Rendered language dashboard sections, keyed by content hash
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'langdata-fragments',
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+    # Sessions and authenticated users; file based so every worker on the
+    # node sees the same entries and a logout in one worker ends the session
+    # everywhere
+    'auth': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('AUTH_CACHE_DIR', str(BASE_DIR / '.cache' / 'auth')),
+        # Entries of another database sharing the directory never match
+        'KEY_PREFIX': hashlib.sha256(str(DATABASES['default']['NAME']).encode()).hexdigest()[:12],
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+# Sessions are read from the cache and written through to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'auth'
+
+# request.user is resolved from the cache; see accounts.backends
+AUTHENTICATION_BACKENDS = ['accounts.backends.CachedModelBackend']
+USER_CACHE_ALIAS = 'auth'
+USER_CACHE_TIMEOUT = 300
+
+# Language data: number of normalized documents kept in each worker's memory
+LANGDATA_CACHE_SIZE = int(os.environ.get('LANGDATA_CACHE_SIZE', 64))
+# Pre-normalized bundle built by scripts/build_langdata_snapshot.py
+LANGDATA_SNAPSHOT_PATH = BASE_DIR / 'langdata' / '.snapshot.bin'
+# Append edits to a per-language journal instead of rewriting the whole file;
+# fold journals back with scripts/compact_langdata.py
+LANGDATA_JOURNAL = os.environ.get('LANGDATA_JOURNAL', '') == '1'
+LANGDATA_FRAGMENT_CACHE = 'fragments'
+
+# Recent requests kept per view for the /dashboard/timings/ percentiles
+SERVER_TIMING_SAMPLES = 1000
+
+# Per-process metric files summed by /metrics/
+METRICS_DIR = Path(os.environ.get('METRICS_DIR', BASE_DIR / '.metrics'))
+# /metrics/ is superuser-only unless the scraper sends
+# "Authorization: Bearer <METRICS_TOKEN>". METRICS_ALLOWED_IPS opens it to
+# networks by REMOTE_ADDR; behind a reverse proxy every client has the
+# proxy's address, so leave it empty there.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = []
+
+# Output of ?_profile=1 requests (collapsed stacks plus a top-functions summary)
+PROFILE_DIR = BASE_DIR / '.profiles'
+
+# Queue contact form submissions and insert them in batches in the background
+# (see contact/queue.py)
+CONTACT_WRITE_BEHIND = os.environ.get('CONTACT_WRITE_BEHIND', '') == '1'
+
 # Email (console for dev)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -0,0 +1 @@
+"""SQLite backend tuned for concurrent web workers; see base.DatabaseWrapper."""
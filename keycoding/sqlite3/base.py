@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+from django.db.backends.sqlite3 import base
+from django.db.backends.sqlite3.base import SQLiteCursorWrapper
+
+from ..metrics import inc, observe
+from ..timing import record_span
+
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection; override or extend with OPTIONS['pragmas'].
+DEFAULT_PRAGMAS = {
+    # Readers no longer block the writer (and vice versa).
+    'journal_mode': 'WAL',
+    # Durable across application crashes; only an OS crash can lose the last
+    # commits, which WAL makes an acceptable trade.
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,  # KiB
+    'temp_store': 'MEMORY',
+    'mmap_size': 128 * 1024 * 1024,
+}
+DEFAULT_TIMEOUT = 20  # seconds a statement waits on a locked database
+LOCK_WARN_SECONDS = 0.5
+
+_stats = {'transactions': 0, 'contended': 0, 'wait_total': 0.0, 'wait_max': 0.0, 'locked_errors': 0}
+_stats_lock = threading.Lock()
+
+
+def lock_stats() -> Dict[str, float]:
+    """Return write-lock acquisition and wait counters for this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _record_wait(waited: float) -> None:
+    with _stats_lock:
+        _stats['transactions'] += 1
+        _stats['wait_total'] += waited
+        _stats['wait_max'] = max(_stats['wait_max'], waited)
+        # An uncontended BEGIN IMMEDIATE takes microseconds.
+        if waited >= 0.001:
+            _stats['contended'] += 1
+    record_span('db-lock', waited)
+    observe('keycoding_db_lock_wait_seconds', waited)
+    if waited >= LOCK_WARN_SECONDS:
+        logger.warning("Waited %.3fs for the SQLite write lock", waited)
+
+
+def _record_locked(exc: sqlite3.OperationalError) -> None:
+    if 'locked' in str(exc) or 'busy' in str(exc):
+        with _stats_lock:
+            _stats['locked_errors'] += 1
+        inc('keycoding_db_locked_errors_total')
+
+
+class CursorWrapper(SQLiteCursorWrapper):
+    def execute(self, query, params=None):
+        try:
+            return super().execute(query, params)
+        except sqlite3.OperationalError as exc:
+            _record_locked(exc)
+            raise
+
+    def executemany(self, query, param_list):
+        try:
+            return super().executemany(query, param_list)
+        except sqlite3.OperationalError as exc:
+            _record_locked(exc)
+            raise
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite with WAL, a busy timeout, tuned pragmas and IMMEDIATE transactions.
+
+    ``atomic()`` blocks take the write lock at BEGIN, so a transaction that
+    reads before writing waits for the lock (up to the busy timeout) instead
+    of failing with "database is locked" when it tries to upgrade. The time
+    spent waiting is recorded in :func:`lock_stats` and the metrics endpoint.
+    """
+
+    def get_connection_params(self):
+        pragmas = {**DEFAULT_PRAGMAS, **self.settings_dict['OPTIONS'].get('pragmas', {})}
+        # The parent copies OPTIONS into a new dict of connect() arguments;
+        # 'pragmas' is ours and sqlite3.connect() would reject it, so it is
+        # dropped from that copy. The settings dict, shared by every
+        # thread's connection, is never modified.
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.setdefault('timeout', DEFAULT_TIMEOUT)
+        self._pragmas = pragmas
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        conn.execute(f"PRAGMA busy_timeout = {int(conn_params['timeout'] * 1000)}")
+        for name, value in self._pragmas.items():
+            if name == 'journal_mode' and self.is_in_memory_db():
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        return self.connection.cursor(factory=CursorWrapper)
+
+    def _start_transaction_under_autocommit(self):
+        started = time.perf_counter()
+        try:
+            self.cursor().execute(f"BEGIN {self.transaction_mode or 'IMMEDIATE'}")
+        finally:
+            _record_wait(time.perf_counter() - started)
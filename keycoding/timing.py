@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+
+SERVER_TIMING_SAMPLES = getattr(settings, 'SERVER_TIMING_SAMPLES', 1000)
+PERCENTILES = (50, 95, 99)
+
+# span name -> [seconds, count] for the request being handled, or None outside
+# of ServerTimingMiddleware (scripts, shell), where spans cost one lookup.
+_current: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar('server_timing_spans', default=None)
+
+# view name -> span name -> recent durations in seconds; 'total' is the whole
+# request as seen by the middleware.
+_samples: Dict[str, Dict[str, Deque[float]]] = {}
+_samples_lock = threading.Lock()
+
+
+def record_span(name: str, seconds: float) -> None:
+    """Add ``seconds`` to span ``name`` of the current request, if any."""
+    spans = _current.get()
+    if spans is None:
+        return
+    entry = spans.get(name)
+    if entry is None:
+        spans[name] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as span ``name`` of the current request."""
+    if _current.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def _time_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_span('db', time.perf_counter() - start)
+
+
+def _header(spans: Dict[str, List[float]], total: float) -> str:
+    parts = []
+    for name, (seconds, count) in spans.items():
+        part = f'{name};dur={seconds * 1000:.2f}'
+        if count > 1:
+            part += f';desc="{count}x"'
+        parts.append(part)
+    parts.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(parts)
+
+
+def _record(view: str, spans: Dict[str, List[float]], total: float) -> None:
+    with _samples_lock:
+        by_span = _samples.setdefault(view, {})
+        for name, seconds in [('total', total), *((name, entry[0]) for name, entry in spans.items())]:
+            samples = by_span.get(name)
+            if samples is None:
+                samples = by_span[name] = deque(maxlen=max(SERVER_TIMING_SAMPLES, 1))
+            samples.append(seconds)
+
+
+def _may_see_timings(request) -> bool:
+    # Span timings reveal cache hits and query counts, so only staff get
+    # them outside DEBUG.
+    if settings.DEBUG:
+        return True
+    user = getattr(request, 'user', None)
+    return user is not None and (user.is_staff or user.is_superuser)
+
+
+class ServerTimingMiddleware:
+    """Collect per-request spans, send them as ``Server-Timing`` to staff
+    (everyone when DEBUG is on) and keep recent durations per view for
+    :func:`timing_summary`.
+
+    Install it first so session and auth queries fall inside the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        spans: Dict[str, List[float]] = {}
+        token = _current.set(spans)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_time_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - start
+
+        if _may_see_timings(request):
+            existing = response.get('Server-Timing')
+            header = _header(spans, total)
+            response['Server-Timing'] = f'{existing}, {header}' if existing else header
+            if not settings.DEBUG:
+                # Keep shared caches from handing a staff response to others.
+                patch_vary_headers(response, ('Cookie',))
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            _record(match.view_name or match._func_path, spans, total)
+        return response
+
+
+def _percentile(ordered: List[float], pct: int) -> float:
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def timing_summary() -> Dict[str, Dict[str, Any]]:
+    """Return p50/p95/p99 in milliseconds per view and span over recent requests."""
+    with _samples_lock:
+        snapshot = {view: {name: list(samples) for name, samples in by_span.items()} for view, by_span in _samples.items()}
+    summary: Dict[str, Dict[str, Any]] = {}
+    for view, by_span in sorted(snapshot.items()):
+        spans = {}
+        for name, samples in by_span.items():
+            ordered = sorted(samples)
+            spans[name] = {
+                'count': len(ordered),
+                **{f'p{pct}': round(_percentile(ordered, pct) * 1000, 2) for pct in PERCENTILES},
+            }
+        summary[view] = {'requests': spans['total']['count'], 'spans': spans}
+    return summary
+
+
+def reset_timings() -> None:
+    with _samples_lock:
+        _samples.clear()
+
+
+__all__ = [
+    'ServerTimingMiddleware',
+    'span',
+    'record_span',
+    'timing_summary',
+    'reset_timings',
+]
@@ -2,7 +2,17 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from .views import home_view, dashboard_view, language_dashboard_view
+from .views import (
+    home_view,
+    dashboard_view,
+    search_view,
+    language_dashboard_view,
+    language_builtins_view,
+    language_batch_view,
+    language_manage_section_view,
+    timings_view,
+    metrics_view,
+)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -12,8 +22,14 @@ urlpatterns = [
     path('contact/', include('contact.urls')),
     # Landing / Sales page (redirects to dashboard if authenticated)
     path('', home_view, name='home'),
+    path('metrics/', metrics_view, name='metrics'),
     path('dashboard/', dashboard_view, name='dashboard'),
+    path('dashboard/search/', search_view, name='search'),
+    path('dashboard/timings/', timings_view, name='timings'),
     path('dashboard/<slug:lang>/', language_dashboard_view, name='language_dashboard'),
+    path('dashboard/<slug:lang>/builtins/', language_builtins_view, name='language_builtins'),
+    path('dashboard/<slug:lang>/batch/', language_batch_view, name='language_batch'),
+    path('dashboard/<slug:lang>/manage/<str:section>/', language_manage_section_view, name='language_manage_section'),
 ]
 
 if settings.DEBUG:
@@ -1,14 +1,37 @@
+import hashlib
+import hmac
+import ipaddress
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import Http404, HttpResponseForbidden
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse
 from django.shortcuts import redirect, render
-from django.utils.text import slugify
-
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+
+from .builtin_index import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    get_builtin_index,
+    search_builtins,
+)
+from .catalog import catalog_summaries, category_tiles, resolve_language
+from .fragments import fragment_cache_alias, section_digests
 from .langdata import (
-    load_language_data,
-    normalize_language_data,
+    get_language_data,
+    language_data_stamp,
+    language_data_lock,
+    load_normalized_language_data,
     save_language_data,
 )
+from .metrics import inc, render_metrics
+from .search import search
+from .sqlite3.base import lock_stats as db_lock_stats
+from .timing import span, timing_summary
 
 
 def _clean_text(value):
@@ -29,596 +52,702 @@ def _parse_index(raw, *, label: str) -> int:
     return idx
 
 
-def _apply_language_action(data, action, payload):
-    if not action:
-        raise ValueError("Unrecognised action")
-
-    if action == 'update_language_meta':
-        data['name'] = _clean_text(payload.get('name')) or data.get('name', '')
-        data['version'] = _clean_text(payload.get('version'))
-        return 'Language details updated'
-
-    if action == 'add_quick_start':
-        title = _clean_text(payload.get('title'))
-        description = _clean_multiline(payload.get('description'))
-        code = _clean_multiline(payload.get('code'))
-        if not title:
-            raise ValueError('Title is required for Quick Start entries')
-        data.setdefault('quick_start', []).append({
-            'title': title,
-            'description': description,
-            'code': code,
-        })
-        return 'Quick Start entry added'
-
-    if action == 'update_quick_start':
-        index = _parse_index(payload.get('index'), label='Quick Start')
-        entries = data.setdefault('quick_start', [])
-        if index >= len(entries):
-            raise ValueError('Quick Start entry not found')
-        title = _clean_text(payload.get('title'))
-        if not title:
-            raise ValueError('Title is required for Quick Start entries')
-        entries[index] = {
-            'title': title,
-            'description': _clean_multiline(payload.get('description')),
-            'code': _clean_multiline(payload.get('code')),
-        }
-        return 'Quick Start entry updated'
-
-    if action == 'delete_quick_start':
-        index = _parse_index(payload.get('index'), label='Quick Start')
-        entries = data.setdefault('quick_start', [])
-        if index >= len(entries):
-            raise ValueError('Quick Start entry not found')
-        entries.pop(index)
-        return 'Quick Start entry removed'
-
-    if action == 'add_concept':
-        concept_id = _clean_text(payload.get('concept_id'))
-        title = _clean_text(payload.get('title'))
-        if not concept_id:
-            raise ValueError('Concept ID is required')
-        if not title:
-            raise ValueError('Concept title is required')
-        data.setdefault('concepts', []).append({
-            'id': concept_id,
-            'title': title,
-            'tag': _clean_text(payload.get('tag')),
-            'description': _clean_multiline(payload.get('description')),
-            'code': _clean_multiline(payload.get('code')),
-        })
-        return 'Concept added'
-
-    if action == 'update_concept':
-        index = _parse_index(payload.get('index'), label='concept')
-        concepts = data.setdefault('concepts', [])
-        if index >= len(concepts):
-            raise ValueError('Concept not found')
-        concept_id = _clean_text(payload.get('concept_id'))
-        title = _clean_text(payload.get('title'))
-        if not concept_id:
-            raise ValueError('Concept ID is required')
-        if not title:
-            raise ValueError('Concept title is required')
-        concepts[index] = {
-            'id': concept_id,
-            'title': title,
-            'tag': _clean_text(payload.get('tag')),
-            'description': _clean_multiline(payload.get('description')),
-            'code': _clean_multiline(payload.get('code')),
-        }
-        return 'Concept updated'
-
-    if action == 'delete_concept':
-        index = _parse_index(payload.get('index'), label='concept')
-        concepts = data.setdefault('concepts', [])
-        if index >= len(concepts):
-            raise ValueError('Concept not found')
-        concepts.pop(index)
-        return 'Concept removed'
-
-    if action == 'add_common_task':
-        group_name = _clean_text(payload.get('group'))
-        title = _clean_text(payload.get('title'))
-        if not group_name:
-            raise ValueError('Task group is required')
-        if not title:
-            raise ValueError('Task title is required')
-        task = {
-            'title': title,
-            'description': _clean_multiline(payload.get('description')),
-            'code': _clean_multiline(payload.get('code')),
-        }
-        groups = data.setdefault('common_tasks', [])
-        for group in groups:
-            if group.get('group') == group_name:
-                group.setdefault('tasks', []).append(task)
-                break
+# Registry of edit actions: action name -> handler(data, payload) returning the
+# success message. Handlers mutate ``data`` in place and raise ValueError with
+# a user-facing message when the payload is invalid.
+_LANGUAGE_ACTIONS = {}
+
+
+def _language_action(name):
+    def register(func):
+        _LANGUAGE_ACTIONS[name] = func
+        return func
+    return register
+
+
+@_language_action('update_language_meta')
+def _update_language_meta(data, payload):
+    data['name'] = _clean_text(payload.get('name')) or data.get('name', '')
+    data['version'] = _clean_text(payload.get('version'))
+    return 'Language details updated'
+
+
+@_language_action('add_quick_start')
+def _add_quick_start(data, payload):
+    title = _clean_text(payload.get('title'))
+    description = _clean_multiline(payload.get('description'))
+    code = _clean_multiline(payload.get('code'))
+    if not title:
+        raise ValueError('Title is required for Quick Start entries')
+    data.setdefault('quick_start', []).append({
+        'title': title,
+        'description': description,
+        'code': code,
+    })
+    return 'Quick Start entry added'
+
+
+@_language_action('update_quick_start')
+def _update_quick_start(data, payload):
+    index = _parse_index(payload.get('index'), label='Quick Start')
+    entries = data.setdefault('quick_start', [])
+    if index >= len(entries):
+        raise ValueError('Quick Start entry not found')
+    title = _clean_text(payload.get('title'))
+    if not title:
+        raise ValueError('Title is required for Quick Start entries')
+    entries[index] = {
+        'title': title,
+        'description': _clean_multiline(payload.get('description')),
+        'code': _clean_multiline(payload.get('code')),
+    }
+    return 'Quick Start entry updated'
+
+
+@_language_action('delete_quick_start')
+def _delete_quick_start(data, payload):
+    index = _parse_index(payload.get('index'), label='Quick Start')
+    entries = data.setdefault('quick_start', [])
+    if index >= len(entries):
+        raise ValueError('Quick Start entry not found')
+    entries.pop(index)
+    return 'Quick Start entry removed'
+
+
+@_language_action('add_concept')
+def _add_concept(data, payload):
+    concept_id = _clean_text(payload.get('concept_id'))
+    title = _clean_text(payload.get('title'))
+    if not concept_id:
+        raise ValueError('Concept ID is required')
+    if not title:
+        raise ValueError('Concept title is required')
+    data.setdefault('concepts', []).append({
+        'id': concept_id,
+        'title': title,
+        'tag': _clean_text(payload.get('tag')),
+        'description': _clean_multiline(payload.get('description')),
+        'code': _clean_multiline(payload.get('code')),
+    })
+    return 'Concept added'
+
+
+@_language_action('update_concept')
+def _update_concept(data, payload):
+    index = _parse_index(payload.get('index'), label='concept')
+    concepts = data.setdefault('concepts', [])
+    if index >= len(concepts):
+        raise ValueError('Concept not found')
+    concept_id = _clean_text(payload.get('concept_id'))
+    title = _clean_text(payload.get('title'))
+    if not concept_id:
+        raise ValueError('Concept ID is required')
+    if not title:
+        raise ValueError('Concept title is required')
+    concepts[index] = {
+        'id': concept_id,
+        'title': title,
+        'tag': _clean_text(payload.get('tag')),
+        'description': _clean_multiline(payload.get('description')),
+        'code': _clean_multiline(payload.get('code')),
+    }
+    return 'Concept updated'
+
+
+@_language_action('delete_concept')
+def _delete_concept(data, payload):
+    index = _parse_index(payload.get('index'), label='concept')
+    concepts = data.setdefault('concepts', [])
+    if index >= len(concepts):
+        raise ValueError('Concept not found')
+    concepts.pop(index)
+    return 'Concept removed'
+
+
+@_language_action('add_common_task')
+def _add_common_task(data, payload):
+    group_name = _clean_text(payload.get('group'))
+    title = _clean_text(payload.get('title'))
+    if not group_name:
+        raise ValueError('Task group is required')
+    if not title:
+        raise ValueError('Task title is required')
+    task = {
+        'title': title,
+        'description': _clean_multiline(payload.get('description')),
+        'code': _clean_multiline(payload.get('code')),
+    }
+    groups = data.setdefault('common_tasks', [])
+    for group in groups:
+        if group.get('group') == group_name:
+            group.setdefault('tasks', []).append(task)
+            break
+    else:
+        groups.append({'group': group_name, 'tasks': [task]})
+    return 'Task added'
+
+
+@_language_action('update_common_task')
+def _update_common_task(data, payload):
+    group_index = _parse_index(payload.get('group_index'), label='task group')
+    task_index = _parse_index(payload.get('task_index'), label='task')
+    groups = data.setdefault('common_tasks', [])
+    if group_index >= len(groups):
+        raise ValueError('Task group not found')
+    group = groups[group_index]
+    tasks = group.setdefault('tasks', [])
+    if task_index >= len(tasks):
+        raise ValueError('Task not found')
+    title = _clean_text(payload.get('title'))
+    if not title:
+        raise ValueError('Task title is required')
+    original_group_name = group.get('group', '')
+    updated_group_name = _clean_text(payload.get('group')) or original_group_name
+    task = {
+        'title': title,
+        'description': _clean_multiline(payload.get('description')),
+        'code': _clean_multiline(payload.get('code')),
+    }
+    tasks.pop(task_index)
+    removed_group = False
+    if not tasks:
+        groups.pop(group_index)
+        removed_group = True
+    if updated_group_name:
+        if not removed_group and updated_group_name == original_group_name:
+            # Reinsert into same group at the original position to keep ordering stable.
+            group.setdefault('tasks', []).insert(min(task_index, len(group['tasks'])), task)
         else:
-            groups.append({'group': group_name, 'tasks': [task]})
-        return 'Task added'
-
-    if action == 'update_common_task':
-        group_index = _parse_index(payload.get('group_index'), label='task group')
-        task_index = _parse_index(payload.get('task_index'), label='task')
-        groups = data.setdefault('common_tasks', [])
-        if group_index >= len(groups):
-            raise ValueError('Task group not found')
-        group = groups[group_index]
-        tasks = group.setdefault('tasks', [])
-        if task_index >= len(tasks):
-            raise ValueError('Task not found')
-        title = _clean_text(payload.get('title'))
-        if not title:
-            raise ValueError('Task title is required')
-        original_group_name = group.get('group', '')
-        updated_group_name = _clean_text(payload.get('group')) or original_group_name
-        task = {
-            'title': title,
-            'description': _clean_multiline(payload.get('description')),
-            'code': _clean_multiline(payload.get('code')),
-        }
-        tasks.pop(task_index)
-        removed_group = False
-        if not tasks:
-            groups.pop(group_index)
-            removed_group = True
-        if updated_group_name:
-            if not removed_group and updated_group_name == original_group_name:
-                # Reinsert into same group at the original position to keep ordering stable.
-                group.setdefault('tasks', []).insert(min(task_index, len(group['tasks'])), task)
+            for candidate in groups:
+                if candidate.get('group') == updated_group_name:
+                    candidate.setdefault('tasks', []).append(task)
+                    break
             else:
-                for candidate in groups:
-                    if candidate.get('group') == updated_group_name:
-                        candidate.setdefault('tasks', []).append(task)
-                        break
-                else:
-                    groups.append({
-                        'group': updated_group_name,
-                        'tasks': [task],
-                    })
-        return 'Task updated'
-
-    if action == 'delete_common_task':
-        group_index = _parse_index(payload.get('group_index'), label='task group')
-        task_index = _parse_index(payload.get('task_index'), label='task')
-        groups = data.setdefault('common_tasks', [])
-        if group_index >= len(groups):
-            raise ValueError('Task group not found')
-        group = groups[group_index]
-        tasks = group.setdefault('tasks', [])
-        if task_index >= len(tasks):
-            raise ValueError('Task not found')
-        tasks.pop(task_index)
-        if not tasks:
-            groups.pop(group_index)
-        return 'Task removed'
-
-    if action == 'rename_common_task_group':
-        group_index = _parse_index(payload.get('group_index'), label='task group')
-        new_name = _clean_text(payload.get('group'))
-        if not new_name:
-            raise ValueError('Group name is required')
-        groups = data.setdefault('common_tasks', [])
-        if group_index >= len(groups):
-            raise ValueError('Task group not found')
-        groups[group_index]['group'] = new_name
-        return 'Task group renamed'
-
-    if action == 'delete_common_task_group':
-        group_index = _parse_index(payload.get('group_index'), label='task group')
-        groups = data.setdefault('common_tasks', [])
-        if group_index >= len(groups):
-            raise ValueError('Task group not found')
+                groups.append({
+                    'group': updated_group_name,
+                    'tasks': [task],
+                })
+    return 'Task updated'
+
+
+@_language_action('delete_common_task')
+def _delete_common_task(data, payload):
+    group_index = _parse_index(payload.get('group_index'), label='task group')
+    task_index = _parse_index(payload.get('task_index'), label='task')
+    groups = data.setdefault('common_tasks', [])
+    if group_index >= len(groups):
+        raise ValueError('Task group not found')
+    group = groups[group_index]
+    tasks = group.setdefault('tasks', [])
+    if task_index >= len(tasks):
+        raise ValueError('Task not found')
+    tasks.pop(task_index)
+    if not tasks:
         groups.pop(group_index)
-        return 'Task group removed'
-
-    if action == 'add_project':
-        title = _clean_text(payload.get('title'))
-        if not title:
-            raise ValueError('Project title is required')
-        data.setdefault('projects', []).append({
-            'title': title,
-            'summary': _clean_text(payload.get('summary')),
-            'description': _clean_multiline(payload.get('description')),
-            'steps': [],
-        })
-        return 'Project added'
-
-    if action == 'update_project':
-        project_index = _parse_index(payload.get('project_index'), label='project')
-        projects = data.setdefault('projects', [])
-        if project_index >= len(projects):
-            raise ValueError('Project not found')
-        title = _clean_text(payload.get('title'))
-        if not title:
-            raise ValueError('Project title is required')
-        project = projects[project_index]
-        project.update({
-            'title': title,
-            'summary': _clean_text(payload.get('summary')),
-            'description': _clean_multiline(payload.get('description')),
-        })
-        return 'Project updated'
-
-    if action == 'delete_project':
-        project_index = _parse_index(payload.get('project_index'), label='project')
-        projects = data.setdefault('projects', [])
-        if project_index >= len(projects):
-            raise ValueError('Project not found')
-        projects.pop(project_index)
-        return 'Project removed'
-
-    if action == 'add_project_step':
-        project_index = _parse_index(payload.get('project_index'), label='project')
-        projects = data.setdefault('projects', [])
-        if project_index >= len(projects):
-            raise ValueError('Project not found')
-        title = _clean_text(payload.get('title'))
-        text = _clean_multiline(payload.get('text'))
-        code = _clean_multiline(payload.get('code'))
-        if not any([title, text, code]):
-            raise ValueError('Provide at least one field for the step')
-        projects[project_index].setdefault('steps', []).append({
-            'title': title,
-            'text': text,
-            'code': code,
-        })
-        return 'Project step added'
-
-    if action == 'update_project_step':
-        project_index = _parse_index(payload.get('project_index'), label='project')
-        step_index = _parse_index(payload.get('step_index'), label='project step')
-        projects = data.setdefault('projects', [])
-        if project_index >= len(projects):
-            raise ValueError('Project not found')
-        steps = projects[project_index].setdefault('steps', [])
-        if step_index >= len(steps):
-            raise ValueError('Project step not found')
-        title = _clean_text(payload.get('title'))
-        text = _clean_multiline(payload.get('text'))
-        code = _clean_multiline(payload.get('code'))
-        if not any([title, text, code]):
-            raise ValueError('Provide at least one field for the step')
-        steps[step_index] = {
-            'title': title,
-            'text': text,
-            'code': code,
-        }
-        return 'Project step updated'
-
-    if action == 'delete_project_step':
-        project_index = _parse_index(payload.get('project_index'), label='project')
-        step_index = _parse_index(payload.get('step_index'), label='project step')
-        projects = data.setdefault('projects', [])
-        if project_index >= len(projects):
-            raise ValueError('Project not found')
-        steps = projects[project_index].setdefault('steps', [])
-        if step_index >= len(steps):
-            raise ValueError('Project step not found')
-        steps.pop(step_index)
-        return 'Project step removed'
-
-    if action == 'add_glossary':
-        term = _clean_text(payload.get('term'))
-        definition = _clean_multiline(payload.get('definition'))
-        if not term:
-            raise ValueError('Glossary term is required')
-        if not definition:
-            raise ValueError('Glossary definition is required')
-        data.setdefault('glossary', []).append({'term': term, 'definition': definition})
-        return 'Glossary entry added'
-
-    if action == 'update_glossary':
-        index = _parse_index(payload.get('index'), label='glossary entry')
-        glossary = data.setdefault('glossary', [])
-        if index >= len(glossary):
-            raise ValueError('Glossary entry not found')
-        term = _clean_text(payload.get('term'))
-        definition = _clean_multiline(payload.get('definition'))
-        if not term:
-            raise ValueError('Glossary term is required')
-        if not definition:
-            raise ValueError('Glossary definition is required')
-        glossary[index] = {'term': term, 'definition': definition}
-        return 'Glossary entry updated'
-
-    if action == 'delete_glossary':
-        index = _parse_index(payload.get('index'), label='glossary entry')
-        glossary = data.setdefault('glossary', [])
-        if index >= len(glossary):
-            raise ValueError('Glossary entry not found')
-        glossary.pop(index)
-        return 'Glossary entry removed'
-
-    if action == 'add_tip':
-        note = _clean_multiline(payload.get('note'))
-        if not note:
-            raise ValueError('Tip note is required')
-        data.setdefault('tips', []).append({
-            'title': _clean_text(payload.get('title')),
-            'note': note,
-        })
-        return 'Tip added'
-
-    if action == 'update_tip':
-        index = _parse_index(payload.get('index'), label='tip')
-        tips = data.setdefault('tips', [])
-        if index >= len(tips):
-            raise ValueError('Tip not found')
-        note = _clean_multiline(payload.get('note'))
-        if not note:
-            raise ValueError('Tip note is required')
-        tips[index] = {
-            'title': _clean_text(payload.get('title')),
-            'note': note,
-        }
-        return 'Tip updated'
-
-    if action == 'delete_tip':
-        index = _parse_index(payload.get('index'), label='tip')
-        tips = data.setdefault('tips', [])
-        if index >= len(tips):
-            raise ValueError('Tip not found')
-        tips.pop(index)
-        return 'Tip removed'
-
-    if action == 'add_builtin':
-        name = _clean_text(payload.get('name'))
-        if not name:
-            raise ValueError('Built-in name is required')
-        data.setdefault('builtins', []).append({
-            'name': name,
-            'kind': _clean_text(payload.get('kind')),
-            'signature': _clean_text(payload.get('signature')),
-            'description': _clean_multiline(payload.get('description')),
-        })
-        return 'Built-in entry added'
-
-    if action == 'update_builtin':
-        index = _parse_index(payload.get('index'), label='built-in')
-        builtins = data.setdefault('builtins', [])
-        if index >= len(builtins):
-            raise ValueError('Built-in not found')
-        name = _clean_text(payload.get('name'))
-        if not name:
-            raise ValueError('Built-in name is required')
-        builtins[index] = {
-            'name': name,
-            'kind': _clean_text(payload.get('kind')),
-            'signature': _clean_text(payload.get('signature')),
-            'description': _clean_multiline(payload.get('description')),
-        }
-        return 'Built-in entry updated'
-
-    if action == 'delete_builtin':
-        index = _parse_index(payload.get('index'), label='built-in')
-        builtins = data.setdefault('builtins', [])
-        if index >= len(builtins):
-            raise ValueError('Built-in not found')
-        builtins.pop(index)
-        return 'Built-in entry removed'
-
-    if action == 'add_stdlib':
-        name = _clean_text(payload.get('name'))
-        if not name:
-            raise ValueError('Standard library name is required')
-        data.setdefault('stdlib', []).append({
-            'name': name,
-            'description': _clean_multiline(payload.get('description')),
-        })
-        return 'Standard library entry added'
-
-    if action == 'update_stdlib':
-        index = _parse_index(payload.get('index'), label='standard library entry')
-        stdlib = data.setdefault('stdlib', [])
-        if index >= len(stdlib):
-            raise ValueError('Standard library entry not found')
-        name = _clean_text(payload.get('name'))
-        if not name:
-            raise ValueError('Standard library name is required')
-        stdlib[index] = {
-            'name': name,
-            'description': _clean_multiline(payload.get('description')),
-        }
-        return 'Standard library entry updated'
-
-    if action == 'delete_stdlib':
-        index = _parse_index(payload.get('index'), label='standard library entry')
-        stdlib = data.setdefault('stdlib', [])
-        if index >= len(stdlib):
-            raise ValueError('Standard library entry not found')
-        stdlib.pop(index)
-        return 'Standard library entry removed'
-
-    if action == 'add_tool':
-        name = _clean_text(payload.get('name'))
-        if not name:
-            raise ValueError('Tool name is required')
-        data.setdefault('tools', []).append({
-            'name': name,
-            'description': _clean_multiline(payload.get('description')),
-        })
-        return 'Tool added'
-
-    if action == 'update_tool':
-        index = _parse_index(payload.get('index'), label='tool')
-        tools = data.setdefault('tools', [])
-        if index >= len(tools):
-            raise ValueError('Tool not found')
-        name = _clean_text(payload.get('name'))
-        if not name:
-            raise ValueError('Tool name is required')
-        tools[index] = {
-            'name': name,
-            'description': _clean_multiline(payload.get('description')),
-        }
-        return 'Tool updated'
-
-    if action == 'delete_tool':
-        index = _parse_index(payload.get('index'), label='tool')
-        tools = data.setdefault('tools', [])
-        if index >= len(tools):
-            raise ValueError('Tool not found')
-        tools.pop(index)
-        return 'Tool removed'
-
-    if action == 'add_link':
-        title = _clean_text(payload.get('title'))
-        url = _clean_text(payload.get('url'))
-        if not title:
-            raise ValueError('Link title is required')
-        if not url:
-            raise ValueError('Link URL is required')
-        data.setdefault('links', []).append({
-            'title': title,
-            'url': url,
-            'description': _clean_multiline(payload.get('description')),
-        })
-        return 'Link added'
-
-    if action == 'update_link':
-        index = _parse_index(payload.get('index'), label='link')
-        links = data.setdefault('links', [])
-        if index >= len(links):
-            raise ValueError('Link not found')
-        title = _clean_text(payload.get('title'))
-        url = _clean_text(payload.get('url'))
-        if not title:
-            raise ValueError('Link title is required')
-        if not url:
-            raise ValueError('Link URL is required')
-        links[index] = {
-            'title': title,
-            'url': url,
-            'description': _clean_multiline(payload.get('description')),
-        }
-        return 'Link updated'
-
-    if action == 'delete_link':
-        index = _parse_index(payload.get('index'), label='link')
-        links = data.setdefault('links', [])
-        if index >= len(links):
-            raise ValueError('Link not found')
-        links.pop(index)
-        return 'Link removed'
-
-    raise ValueError('Unrecognised action')
+    return 'Task removed'
+
+
+@_language_action('rename_common_task_group')
+def _rename_common_task_group(data, payload):
+    group_index = _parse_index(payload.get('group_index'), label='task group')
+    new_name = _clean_text(payload.get('group'))
+    if not new_name:
+        raise ValueError('Group name is required')
+    groups = data.setdefault('common_tasks', [])
+    if group_index >= len(groups):
+        raise ValueError('Task group not found')
+    groups[group_index]['group'] = new_name
+    return 'Task group renamed'
+
+
+@_language_action('delete_common_task_group')
+def _delete_common_task_group(data, payload):
+    group_index = _parse_index(payload.get('group_index'), label='task group')
+    groups = data.setdefault('common_tasks', [])
+    if group_index >= len(groups):
+        raise ValueError('Task group not found')
+    groups.pop(group_index)
+    return 'Task group removed'
+
+
+@_language_action('add_project')
+def _add_project(data, payload):
+    title = _clean_text(payload.get('title'))
+    if not title:
+        raise ValueError('Project title is required')
+    data.setdefault('projects', []).append({
+        'title': title,
+        'summary': _clean_text(payload.get('summary')),
+        'description': _clean_multiline(payload.get('description')),
+        'steps': [],
+    })
+    return 'Project added'
+
+
+@_language_action('update_project')
+def _update_project(data, payload):
+    project_index = _parse_index(payload.get('project_index'), label='project')
+    projects = data.setdefault('projects', [])
+    if project_index >= len(projects):
+        raise ValueError('Project not found')
+    title = _clean_text(payload.get('title'))
+    if not title:
+        raise ValueError('Project title is required')
+    project = projects[project_index]
+    project.update({
+        'title': title,
+        'summary': _clean_text(payload.get('summary')),
+        'description': _clean_multiline(payload.get('description')),
+    })
+    return 'Project updated'
+
+
+@_language_action('delete_project')
+def _delete_project(data, payload):
+    project_index = _parse_index(payload.get('project_index'), label='project')
+    projects = data.setdefault('projects', [])
+    if project_index >= len(projects):
+        raise ValueError('Project not found')
+    projects.pop(project_index)
+    return 'Project removed'
+
+
+@_language_action('add_project_step')
+def _add_project_step(data, payload):
+    project_index = _parse_index(payload.get('project_index'), label='project')
+    projects = data.setdefault('projects', [])
+    if project_index >= len(projects):
+        raise ValueError('Project not found')
+    title = _clean_text(payload.get('title'))
+    text = _clean_multiline(payload.get('text'))
+    code = _clean_multiline(payload.get('code'))
+    if not any([title, text, code]):
+        raise ValueError('Provide at least one field for the step')
+    projects[project_index].setdefault('steps', []).append({
+        'title': title,
+        'text': text,
+        'code': code,
+    })
+    return 'Project step added'
+
+
+@_language_action('update_project_step')
+def _update_project_step(data, payload):
+    project_index = _parse_index(payload.get('project_index'), label='project')
+    step_index = _parse_index(payload.get('step_index'), label='project step')
+    projects = data.setdefault('projects', [])
+    if project_index >= len(projects):
+        raise ValueError('Project not found')
+    steps = projects[project_index].setdefault('steps', [])
+    if step_index >= len(steps):
+        raise ValueError('Project step not found')
+    title = _clean_text(payload.get('title'))
+    text = _clean_multiline(payload.get('text'))
+    code = _clean_multiline(payload.get('code'))
+    if not any([title, text, code]):
+        raise ValueError('Provide at least one field for the step')
+    steps[step_index] = {
+        'title': title,
+        'text': text,
+        'code': code,
+    }
+    return 'Project step updated'
+
+
+@_language_action('delete_project_step')
+def _delete_project_step(data, payload):
+    project_index = _parse_index(payload.get('project_index'), label='project')
+    step_index = _parse_index(payload.get('step_index'), label='project step')
+    projects = data.setdefault('projects', [])
+    if project_index >= len(projects):
+        raise ValueError('Project not found')
+    steps = projects[project_index].setdefault('steps', [])
+    if step_index >= len(steps):
+        raise ValueError('Project step not found')
+    steps.pop(step_index)
+    return 'Project step removed'
+
+
+@_language_action('add_glossary')
+def _add_glossary(data, payload):
+    term = _clean_text(payload.get('term'))
+    definition = _clean_multiline(payload.get('definition'))
+    if not term:
+        raise ValueError('Glossary term is required')
+    if not definition:
+        raise ValueError('Glossary definition is required')
+    data.setdefault('glossary', []).append({'term': term, 'definition': definition})
+    return 'Glossary entry added'
+
+
+@_language_action('update_glossary')
+def _update_glossary(data, payload):
+    index = _parse_index(payload.get('index'), label='glossary entry')
+    glossary = data.setdefault('glossary', [])
+    if index >= len(glossary):
+        raise ValueError('Glossary entry not found')
+    term = _clean_text(payload.get('term'))
+    definition = _clean_multiline(payload.get('definition'))
+    if not term:
+        raise ValueError('Glossary term is required')
+    if not definition:
+        raise ValueError('Glossary definition is required')
+    glossary[index] = {'term': term, 'definition': definition}
+    return 'Glossary entry updated'
+
+
+@_language_action('delete_glossary')
+def _delete_glossary(data, payload):
+    index = _parse_index(payload.get('index'), label='glossary entry')
+    glossary = data.setdefault('glossary', [])
+    if index >= len(glossary):
+        raise ValueError('Glossary entry not found')
+    glossary.pop(index)
+    return 'Glossary entry removed'
+
+
+@_language_action('add_tip')
+def _add_tip(data, payload):
+    note = _clean_multiline(payload.get('note'))
+    if not note:
+        raise ValueError('Tip note is required')
+    data.setdefault('tips', []).append({
+        'title': _clean_text(payload.get('title')),
+        'note': note,
+    })
+    return 'Tip added'
+
+
+@_language_action('update_tip')
+def _update_tip(data, payload):
+    index = _parse_index(payload.get('index'), label='tip')
+    tips = data.setdefault('tips', [])
+    if index >= len(tips):
+        raise ValueError('Tip not found')
+    note = _clean_multiline(payload.get('note'))
+    if not note:
+        raise ValueError('Tip note is required')
+    tips[index] = {
+        'title': _clean_text(payload.get('title')),
+        'note': note,
+    }
+    return 'Tip updated'
+
+
+@_language_action('delete_tip')
+def _delete_tip(data, payload):
+    index = _parse_index(payload.get('index'), label='tip')
+    tips = data.setdefault('tips', [])
+    if index >= len(tips):
+        raise ValueError('Tip not found')
+    tips.pop(index)
+    return 'Tip removed'
+
+
+@_language_action('add_builtin')
+def _add_builtin(data, payload):
+    name = _clean_text(payload.get('name'))
+    if not name:
+        raise ValueError('Built-in name is required')
+    data.setdefault('builtins', []).append({
+        'name': name,
+        'kind': _clean_text(payload.get('kind')),
+        'signature': _clean_text(payload.get('signature')),
+        'description': _clean_multiline(payload.get('description')),
+    })
+    return 'Built-in entry added'
+
+
+@_language_action('update_builtin')
+def _update_builtin(data, payload):
+    index = _parse_index(payload.get('index'), label='built-in')
+    builtins = data.setdefault('builtins', [])
+    if index >= len(builtins):
+        raise ValueError('Built-in not found')
+    name = _clean_text(payload.get('name'))
+    if not name:
+        raise ValueError('Built-in name is required')
+    builtins[index] = {
+        'name': name,
+        'kind': _clean_text(payload.get('kind')),
+        'signature': _clean_text(payload.get('signature')),
+        'description': _clean_multiline(payload.get('description')),
+    }
+    return 'Built-in entry updated'
+
+
+@_language_action('delete_builtin')
+def _delete_builtin(data, payload):
+    index = _parse_index(payload.get('index'), label='built-in')
+    builtins = data.setdefault('builtins', [])
+    if index >= len(builtins):
+        raise ValueError('Built-in not found')
+    builtins.pop(index)
+    return 'Built-in entry removed'
+
+
+@_language_action('add_stdlib')
+def _add_stdlib(data, payload):
+    name = _clean_text(payload.get('name'))
+    if not name:
+        raise ValueError('Standard library name is required')
+    data.setdefault('stdlib', []).append({
+        'name': name,
+        'description': _clean_multiline(payload.get('description')),
+    })
+    return 'Standard library entry added'
+
+
+@_language_action('update_stdlib')
+def _update_stdlib(data, payload):
+    index = _parse_index(payload.get('index'), label='standard library entry')
+    stdlib = data.setdefault('stdlib', [])
+    if index >= len(stdlib):
+        raise ValueError('Standard library entry not found')
+    name = _clean_text(payload.get('name'))
+    if not name:
+        raise ValueError('Standard library name is required')
+    stdlib[index] = {
+        'name': name,
+        'description': _clean_multiline(payload.get('description')),
+    }
+    return 'Standard library entry updated'
+
+
+@_language_action('delete_stdlib')
+def _delete_stdlib(data, payload):
+    index = _parse_index(payload.get('index'), label='standard library entry')
+    stdlib = data.setdefault('stdlib', [])
+    if index >= len(stdlib):
+        raise ValueError('Standard library entry not found')
+    stdlib.pop(index)
+    return 'Standard library entry removed'
+
+
+@_language_action('add_tool')
+def _add_tool(data, payload):
+    name = _clean_text(payload.get('name'))
+    if not name:
+        raise ValueError('Tool name is required')
+    data.setdefault('tools', []).append({
+        'name': name,
+        'description': _clean_multiline(payload.get('description')),
+    })
+    return 'Tool added'
+
+
+@_language_action('update_tool')
+def _update_tool(data, payload):
+    index = _parse_index(payload.get('index'), label='tool')
+    tools = data.setdefault('tools', [])
+    if index >= len(tools):
+        raise ValueError('Tool not found')
+    name = _clean_text(payload.get('name'))
+    if not name:
+        raise ValueError('Tool name is required')
+    tools[index] = {
+        'name': name,
+        'description': _clean_multiline(payload.get('description')),
+    }
+    return 'Tool updated'
+
+
+@_language_action('delete_tool')
+def _delete_tool(data, payload):
+    index = _parse_index(payload.get('index'), label='tool')
+    tools = data.setdefault('tools', [])
+    if index >= len(tools):
+        raise ValueError('Tool not found')
+    tools.pop(index)
+    return 'Tool removed'
+
+
+@_language_action('add_link')
+def _add_link(data, payload):
+    title = _clean_text(payload.get('title'))
+    url = _clean_text(payload.get('url'))
+    if not title:
+        raise ValueError('Link title is required')
+    if not url:
+        raise ValueError('Link URL is required')
+    data.setdefault('links', []).append({
+        'title': title,
+        'url': url,
+        'description': _clean_multiline(payload.get('description')),
+    })
+    return 'Link added'
+
+
+@_language_action('update_link')
+def _update_link(data, payload):
+    index = _parse_index(payload.get('index'), label='link')
+    links = data.setdefault('links', [])
+    if index >= len(links):
+        raise ValueError('Link not found')
+    title = _clean_text(payload.get('title'))
+    url = _clean_text(payload.get('url'))
+    if not title:
+        raise ValueError('Link title is required')
+    if not url:
+        raise ValueError('Link URL is required')
+    links[index] = {
+        'title': title,
+        'url': url,
+        'description': _clean_multiline(payload.get('description')),
+    }
+    return 'Link updated'
+
+
+@_language_action('delete_link')
+def _delete_link(data, payload):
+    index = _parse_index(payload.get('index'), label='link')
+    links = data.setdefault('links', [])
+    if index >= len(links):
+        raise ValueError('Link not found')
+    links.pop(index)
+    return 'Link removed'
+
+
+def _apply_language_action(data, action, payload):
+    handler = _LANGUAGE_ACTIONS.get(action) if isinstance(action, str) else None
+    if handler is None:
+        raise ValueError("Unrecognised action")
+    try:
+        with span('action'):
+            message = handler(data, payload)
+    except ValueError:
+        inc('keycoding_language_actions_total', action=action, outcome='error')
+        raise
+    inc('keycoding_language_actions_total', action=action, outcome='ok')
+    return message
+
+
+def _render(request, template, context=None):
+    with span('render'):
+        return render(request, template, context)
 
 
 def home_view(request):
     if request.user.is_authenticated:
         return redirect('dashboard')
-    return render(request, 'landing.html')
+    return _render(request, 'landing.html')
 
 
 @login_required
 def dashboard_view(request):
-    categories = {
-        'Frontend': [
-            'JavaScript','TypeScript','HTML','CSS'
-        ],
-        'Backend Web': [
-            'Python','JavaScript','TypeScript','Java','C#','Go','PHP','Ruby','Rust','Kotlin','Scala','Elixir','Clojure','Crystal','Nim'
-        ],
-        'Mobile': [
-            'Swift','Kotlin','Dart','Objective-C'
-        ],
-        'Data / ML / Science': [
-            'Python','R','Julia','MATLAB','SQL'
-        ],
-        'Systems / Low-Level': [
-            'C','C++','Rust','Zig','Assembly','Ada'
-        ],
-        'Scripting / Automation': [
-            'Bash','Shell','PowerShell','Perl','Python','Lua'
-        ],
-        'Functional & Logic': [
-            'Haskell','Elixir','Erlang','F#','OCaml','Scheme','Clojure','Prolog'
-        ],
-        'Blockchain / Smart Contracts': [
-            'Solidity'
-        ],
-        'Legacy / Enterprise': [
-            'COBOL','Fortran','ABAP','Visual Basic .NET','Delphi','Groovy','Apex','Objective-C','Smalltalk'
-        ],
-        'Hardware / HDL': [
-            'VHDL','Verilog'
-        ],
-        'Game / Engines': [
-            'GDScript','Lua'
-        ],
-    }
-
-    slug_map = {
-        'C++': 'cpp',
-        'C#': 'csharp',
-        'F#': 'fsharp',
-        'Visual Basic .NET': 'vbnet',
-        'Objective-C': 'objective-c',
-        'Shell': 'shell',
-        'Bash': 'bash',
-        'PowerShell': 'powershell',
-        'C': 'c',
-        'R': 'r',
-        'Go': 'go',
-        'Rust': 'rust',
-        'JavaScript': 'javascript',
-        'TypeScript': 'typescript',
-        'HTML': 'html',
-        'CSS': 'css',
-    }
-
-    def make_slug(name: str) -> str:
-        return slug_map.get(name, slugify(name))
-
+    summaries = catalog_summaries()
     prepared = {
-        cat: [
-            {'name': name, 'slug': make_slug(name)}
-            for name in names
-        ]
-        for cat, names in categories.items()
+        cat: [{**tile, 'summary': summaries.get(tile['slug'])} for tile in tiles]
+        for cat, tiles in category_tiles().items()
     }
-    return render(request, 'dashboard.html', {'categories': prepared})
+    return _render(request, 'dashboard.html', {'categories': prepared})
 
 
 @login_required
-def language_dashboard_view(request, lang: str):
-    # Build reverse mapping
-    categories = {
-        'Frontend': ['JavaScript','TypeScript','HTML','CSS'],
-        'Backend Web': ['Python','JavaScript','TypeScript','Java','C#','Go','PHP','Ruby','Rust','Kotlin','Scala','Elixir','Clojure','Crystal','Nim'],
-        'Mobile': ['Swift','Kotlin','Dart','Objective-C'],
-        'Data / ML / Science': ['Python','R','Julia','MATLAB','SQL'],
-        'Systems / Low-Level': ['C','C++','Rust','Zig','Assembly','Ada'],
-        'Scripting / Automation': ['Bash','Shell','PowerShell','Perl','Python','Lua'],
-        'Functional & Logic': ['Haskell','Elixir','Erlang','F#','OCaml','Scheme','Clojure','Prolog'],
-        'Blockchain / Smart Contracts': ['Solidity'],
-        'Legacy / Enterprise': ['COBOL','Fortran','ABAP','Visual Basic .NET','Delphi','Groovy','Apex','Objective-C','Smalltalk'],
-        'Hardware / HDL': ['VHDL','Verilog'],
-        'Game / Engines': ['GDScript','Lua'],
-    }
-    slug_map = {
-        'C++': 'cpp', 'C#': 'csharp', 'F#': 'fsharp', 'Visual Basic .NET': 'vbnet',
-        'Objective-C': 'objective-c', 'Shell': 'shell', 'Bash': 'bash', 'PowerShell': 'powershell',
-    }
-    def make_slug(name: str) -> str:
-        return slug_map.get(name, slugify(name))
+def search_view(request):
+    query = _clean_text(request.GET.get('q'))
+    with span('search'):
+        results = search(query) if query else []
+    return _render(request, 'search.html', {'query': query, 'results': results})
+
 
-    all_names = {name for names in categories.values() for name in names}
-    by_slug = {make_slug(name): name for name in all_names}
-    if lang not in by_slug:
+def _resolve_language(lang: str):
+    """Return ``(display_name, categories)`` for a slug or raise Http404."""
+    resolved = resolve_language(lang)
+    if resolved is None:
         raise Http404("Language not found")
-    display_name = by_slug[lang]
-    in_categories = [cat for cat, names in categories.items() if display_name in names]
+    return resolved
 
-    data = normalize_language_data(load_language_data(lang))
+
+def _with_defaults(data, display_name: str, lang: str):
     if not data.get('name'):
         data['name'] = display_name
     if not data.get('slug'):
         data['slug'] = lang
+    return data
+
+
+# Templates whose source affects the rendered language pages; their stamps are
+# part of the validators below so a deploy invalidates cached pages.
+_LANGUAGE_TEMPLATES = (
+    'base.html',
+    'language_dashboard.html',
+    'language_dashboard_manage.html',
+    'manage/_placeholder.html',
+)
+
+
+def _template_stamps():
+    stamps = []
+    for name in _LANGUAGE_TEMPLATES:
+        try:
+            stat = (Path(settings.BASE_DIR) / 'templates' / name).stat()
+        except FileNotFoundError:
+            continue
+        stamps.append((stat.st_mtime_ns, stat.st_size))
+    return stamps
+
+
+def _language_etag(request, lang: str):
+    """Strong validator for a language page, computed without reading the JSON."""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    # Pending flash messages are rendered once and must not be hidden by a 304.
+    if len(messages.get_messages(request)):
+        return None
+    parts = [
+        lang,
+        language_data_stamp(lang),
+        _template_stamps(),
+        request.user.pk,
+        # base.html greets the user by name; a rename must change the page.
+        request.user.get_username(),
+        request.user.is_superuser,
+        request.user.is_superuser and request.GET.get('manage') == '1',
+        # Manage-mode forms embed the CSRF token, which rotates on login.
+        request.META.get('CSRF_COOKIE', ''),
+    ]
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _language_last_modified(request, lang: str):
+    # The mtimes below say nothing about the signed-in user (a rename, a new
+    # login), so only anonymous pages may be revalidated by date alone.
+    if request.user.is_authenticated:
+        return None
+    stamp = language_data_stamp(lang)
+    if stamp is None:
+        return None
+    # Even stamp positions are the JSON file's and the journal's mtimes.
+    mtimes = [*stamp[0::2], *(mtime for mtime, _size in _template_stamps())]
+    return datetime.fromtimestamp(max(mtimes) / 1e9, tz=timezone.utc)
+
+
+def _builtins_etag(request, lang: str):
+    parts = [lang, language_data_stamp(lang), request.GET.urlencode()]
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
 
+def _builtins_last_modified(request, lang: str):
+    stamp = language_data_stamp(lang)
+    if stamp is None:
+        return None
+    return datetime.fromtimestamp(max(stamp[0::2]) / 1e9, tz=timezone.utc)
+
+
+def _parse_page_param(raw, *, default: int, maximum: int) -> int:
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return default
+    return max(0, min(value, maximum))
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_language_etag, last_modified_func=_language_last_modified)
+def language_dashboard_view(request, lang: str):
+    display_name, in_categories = _resolve_language(lang)
     manage_mode = request.user.is_superuser and request.GET.get('manage') == '1'
 
     if request.method == 'POST':
@@ -626,8 +755,16 @@ def language_dashboard_view(request, lang: str):
             return HttpResponseForbidden('Only superusers can edit language data')
         action = request.POST.get('action')
         try:
-            message = _apply_language_action(data, action, request.POST)
-            save_language_data(lang, data)
+            # Hold the lock across load-modify-save so edits from other workers
+            # serialize instead of silently overwriting each other.
+            with language_data_lock(lang):
+                data = _with_defaults(
+                    load_normalized_language_data(lang, strict=True),
+                    display_name,
+                    lang,
+                )
+                message = _apply_language_action(data, action, request.POST)
+                save_language_data(lang, data)
             if message:
                 messages.success(request, message)
         except ValueError as exc:
@@ -637,6 +774,12 @@ def language_dashboard_view(request, lang: str):
             redirect_url = f"{redirect_url}?manage=1"
         return redirect(redirect_url)
 
+    # The cached document is shared across requests, so defaults are filled
+    # in on a shallow copy.
+    data = get_language_data(lang)
+    if not data.get('name') or not data.get('slug'):
+        data = _with_defaults(dict(data), display_name, lang)
+
     context = {
         'lang_slug': lang,
         'lang_name': display_name,
@@ -644,5 +787,197 @@ def language_dashboard_view(request, lang: str):
         'lang': data,
         'manage_mode': manage_mode,
     }
-    template = 'language_dashboard_manage.html' if manage_mode else 'language_dashboard.html'
-    return render(request, template, context)
+    if manage_mode:
+        template = 'language_dashboard_manage.html'
+    else:
+        template = 'language_dashboard.html'
+        # Only the first page of built-ins is rendered; the rest is fetched
+        # from language_builtins_view as the user filters or pages.
+        index = get_builtin_index(lang)
+        total, page = search_builtins(index, limit=DEFAULT_PAGE_SIZE)
+        context.update({
+            'builtins_page': page,
+            'builtins_total': total,
+            'builtins_page_size': DEFAULT_PAGE_SIZE,
+            # Sections are cached as rendered HTML keyed by their content hash.
+            'digests': section_digests(lang),
+            'fragment_cache': fragment_cache_alias(),
+            'fragment_timeout': None,
+        })
+    return _render(request, template, context)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_builtins_etag, last_modified_func=_builtins_last_modified)
+def language_builtins_view(request, lang: str):
+    """JSON page of built-ins filtered by ``q``, ``group``, ``offset`` and ``limit``."""
+    _resolve_language(lang)
+    index = get_builtin_index(lang)
+    query = request.GET.get('q', '')
+    group = request.GET.get('group') or 'all'
+    offset = _parse_page_param(request.GET.get('offset'), default=0, maximum=len(index['items']))
+    limit = _parse_page_param(request.GET.get('limit'), default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+    total, page = search_builtins(index, query=query, group=group, offset=offset, limit=limit)
+    return JsonResponse({
+        'query': query,
+        'group': group,
+        'offset': offset,
+        'limit': limit,
+        'total': total,
+        'counts': index['counts'],
+        'items': [
+            {
+                'index': item['index'],
+                'name': item['name'],
+                'kind': item['kind'],
+                'signature': item['signature'],
+                'description': item['description'],
+                'group': item['group'],
+            }
+            for item in page
+        ],
+    })
+
+
+# Sections of the manage page that are rendered on demand, and how many entries
+# each request renders.
+MANAGE_SECTIONS = (
+    'quick_start',
+    'concepts',
+    'common_tasks',
+    'projects',
+    'glossary',
+    'tips',
+    'builtins',
+    'stdlib',
+    'tools',
+    'links',
+)
+MANAGE_PAGE_SIZE = 25
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+def language_manage_section_view(request, lang: str, section: str):
+    """HTML fragment with one page of a section's manage-mode edit forms."""
+    _resolve_language(lang)
+    if not request.user.is_superuser:
+        return HttpResponseForbidden('Only superusers can edit language data')
+    if section not in MANAGE_SECTIONS:
+        raise Http404('Unknown section')
+    entries = get_language_data(lang).get(section, [])
+    offset = _parse_page_param(request.GET.get('offset'), default=0, maximum=len(entries))
+    page = entries[offset:offset + MANAGE_PAGE_SIZE]
+    next_offset = offset + len(page)
+    remaining = len(entries) - next_offset
+    return _render(request, f'manage/{section}.html', {
+        'lang_slug': lang,
+        'entries': page,
+        'offset': offset,
+        'next_offset': next_offset if remaining > 0 else None,
+        'next_count': min(remaining, MANAGE_PAGE_SIZE),
+        'remaining': remaining,
+    })
+
+
+MAX_BATCH_ACTIONS = 500
+
+
+def _parse_batch(request):
+    """Return the list of action payloads from a JSON body or an ``actions`` form field."""
+    if request.content_type == 'application/json':
+        raw = request.body.decode('utf-8') or '{}'
+    else:
+        raw = request.POST.get('actions') or '[]'
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        raise ValueError('Batch must be valid JSON')
+    actions = parsed.get('actions') if isinstance(parsed, dict) else parsed
+    if not isinstance(actions, list) or not all(isinstance(item, dict) for item in actions):
+        raise ValueError('Batch must be a list of action objects')
+    if not actions:
+        raise ValueError('Batch contains no actions')
+    if len(actions) > MAX_BATCH_ACTIONS:
+        raise ValueError(f'Batch is limited to {MAX_BATCH_ACTIONS} actions')
+    return actions
+
+
+@login_required
+@require_POST
+def language_batch_view(request, lang: str):
+    """Apply an ordered list of edit actions and save once; all or nothing.
+
+    Each item is the same payload a manage-mode form posts, including its
+    ``action`` name.
+    """
+    display_name, _ = _resolve_language(lang)
+    if not request.user.is_superuser:
+        return HttpResponseForbidden('Only superusers can edit language data')
+    try:
+        actions = _parse_batch(request)
+    except ValueError as exc:
+        return JsonResponse({'ok': False, 'error': str(exc)}, status=400)
+
+    results = []
+    try:
+        with language_data_lock(lang):
+            data = _with_defaults(
+                load_normalized_language_data(lang, strict=True),
+                display_name,
+                lang,
+            )
+            for position, payload in enumerate(actions):
+                try:
+                    results.append(_apply_language_action(data, payload.get('action'), payload))
+                except ValueError as exc:
+                    # Nothing has been written yet, so dropping ``data`` rolls
+                    # back every action applied so far.
+                    return JsonResponse({
+                        'ok': False,
+                        'index': position,
+                        'action': payload.get('action'),
+                        'error': str(exc),
+                    }, status=400)
+            save_language_data(lang, data)
+    except ValueError as exc:
+        return JsonResponse({'ok': False, 'error': str(exc)}, status=400)
+    return JsonResponse({'ok': True, 'applied': len(results), 'messages': results})
+
+
+@login_required
+def timings_view(request):
+    """Recent p50/p95/p99 per view and span, in milliseconds."""
+    if not request.user.is_superuser:
+        return HttpResponseForbidden('Only superusers can view timings')
+    return JsonResponse({'views': timing_summary(), 'database': db_lock_stats()})
+
+
+def _metrics_allowed(request) -> bool:
+    if request.user.is_authenticated and request.user.is_superuser:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        scheme, _, supplied = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(supplied.strip().encode(), token.encode()):
+            return True
+    allowed = getattr(settings, 'METRICS_ALLOWED_IPS', [])
+    if not allowed:
+        return False
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in allowed)
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, summed over every worker process.
+
+    Open to superusers, to requests bearing METRICS_TOKEN and to
+    METRICS_ALLOWED_IPS (empty by default).
+    """
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden('Metrics are not available')
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Benchmark language data loading, normalization, saving, edit actions and page renders.
+
+Every benchmark runs against a scratch copy of langdata/, so the real files
+are never modified. The copy is benchmarked as shipped ("real") and again
+with python.json scaled up 10x and 100x ("x10", "x100"). Renders go through
+the Django test client against an in-memory test database. A snapshot is
+not used, so each load reads the JSON.
+
+Results are medians of per-call timings. They are compared with a stored JSON
+baseline, and the exit status is 1 when a benchmark is slower than the
+baseline by more than --threshold.
+
+Usage: python scripts/benchmark_langdata.py [--scales 1,10,100] [--only TEXT]
+                                            [--baseline PATH] [--save-baseline]
+                                            [--output PATH] [--threshold 0.2]
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from copy import deepcopy
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'keycoding.settings')
+
+DEFAULT_BASELINE = ROOT / '.benchmarks' / 'baseline.json'
+SCALED_SLUG = 'python'
+# Fields that identify an entry; scaled copies get a suffix so ids stay unique.
+IDENTITY_FIELDS = ('id', 'title', 'term', 'name', 'group')
+
+# A representative edit session: appends, in-place updates and deletes.
+ACTION_MIX = [
+    {'action': 'add_tip', 'title': 'Benchmark tip', 'note': 'Prefer small functions.'},
+    {'action': 'update_tip', 'index': '0', 'title': 'Updated tip', 'note': 'Updated note.'},
+    {'action': 'add_glossary', 'term': 'benchmark', 'definition': 'A repeatable measurement.'},
+    {'action': 'update_glossary', 'index': '0', 'term': 'term', 'definition': 'Updated definition.'},
+    {'action': 'add_common_task', 'group': 'Benchmarks', 'title': 'Time a function', 'code': 'timeit.timeit(f)'},
+    {'action': 'update_builtin', 'index': '0', 'name': 'abs', 'kind': 'function', 'signature': 'abs(x)', 'description': 'Absolute value.'},
+    {'action': 'add_builtin', 'name': 'bench', 'kind': 'function', 'signature': 'bench()', 'description': 'Benchmark helper.'},
+    {'action': 'add_link', 'title': 'Docs', 'url': 'https://example.com/'},
+    {'action': 'delete_tip', 'index': '0'},
+    {'action': 'delete_builtin', 'index': '0'},
+]
+
+
+def scale_document(doc: dict, factor: int) -> dict:
+    """Repeat every list section of ``doc`` ``factor`` times."""
+    from keycoding.langdata import SUMMARY_SECTIONS
+
+    scaled = deepcopy(doc)
+    for section in SUMMARY_SECTIONS:
+        entries = doc.get(section) or []
+        out = []
+        for copy in range(factor):
+            for entry in entries:
+                item = deepcopy(entry)
+                if copy and isinstance(item, dict):
+                    for field in IDENTITY_FIELDS:
+                        if isinstance(item.get(field), str) and item[field]:
+                            item[field] = f"{item[field]}-{copy}"
+                out.append(item)
+        scaled[section] = out
+    return scaled
+
+
+def measure(func, setup=None, *, min_calls: int, min_time: float) -> dict:
+    """Time ``func(setup())`` per call until both minimums are met."""
+    func(setup() if setup else None)  # warm up
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_calls or (time.perf_counter() - started < min_time and len(timings) < 2000):
+        state = setup() if setup else None
+        t0 = time.perf_counter()
+        func(state)
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+    return {
+        'median': statistics.median(timings),
+        'min': timings[0],
+        'p90': timings[min(int(len(timings) * 0.9), len(timings) - 1)],
+        'calls': len(timings),
+    }
+
+
+def prepare_environment(scratch: Path):
+    """Point langdata and the caches at ``scratch`` and log a superuser in."""
+    # Before settings load, so the throwaway user never reaches the real
+    # auth cache.
+    os.environ['AUTH_CACHE_DIR'] = str(scratch / 'auth-cache')
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from keycoding import langdata, metrics, profiling
+
+    settings.LANGDATA_SNAPSHOT_PATH = scratch / 'no-snapshot.bin'
+    settings.SEARCH_INDEX_PATH = scratch / 'search-index'
+    metrics.METRICS_DIR = scratch / 'metrics'
+    profiling.PROFILE_DIR = scratch / 'profiles'
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+    from django.contrib.auth.models import User
+    from django.test import Client
+    user = User.objects.create_superuser('bench', 'bench@example.com', 'bench-password')
+    client = Client()
+    client.force_login(user)
+    return langdata, client
+
+
+def run_dataset(name: str, factor: int, source: Path, scratch: Path, langdata, client, args) -> dict:
+    from django.core.cache import caches
+    from keycoding.fragments import fragment_cache_alias
+    from keycoding.views import _apply_language_action
+
+    target = scratch / name
+    shutil.copytree(source, target)
+    if factor > 1:
+        doc = json.loads((source / f'{SCALED_SLUG}.json').read_text(encoding='utf-8'))
+        (target / f'{SCALED_SLUG}.json').write_text(
+            json.dumps(scale_document(doc, factor), indent=2, ensure_ascii=False), encoding='utf-8'
+        )
+    langdata.LANGDATA_DIR = target
+    langdata.invalidate_language_cache()
+    caches[fragment_cache_alias()].clear()
+
+    slug = SCALED_SLUG
+    raw = langdata.load_language_data(slug)
+    normalized = langdata.normalize_language_data(raw)
+    url = f'/dashboard/{slug}/'
+    status = client.get(url).status_code
+    if status != 200:
+        raise SystemExit(f"{url} returned {status}; cannot benchmark renders")
+
+    def apply_mix(data):
+        for payload in ACTION_MIX:
+            _apply_language_action(data, payload['action'], payload)
+
+    def render_cold(_):
+        langdata.invalidate_language_cache()
+        caches[fragment_cache_alias()].clear()
+        client.get(url)
+
+    benchmarks = {
+        'load': (lambda _: langdata.load_language_data(slug), None),
+        'normalize': (lambda _: langdata.normalize_language_data(raw), None),
+        'save': (lambda _: langdata.save_language_data(slug, normalized), None),
+        'actions': (apply_mix, lambda: deepcopy(normalized)),
+        'render': (lambda _: client.get(url), None),
+        'render_cold': (render_cold, None),
+        'render_manage': (lambda _: client.get(url + '?manage=1'), None),
+    }
+    if factor == 1:
+        slugs = langdata.language_slugs()
+        benchmarks['load_all'] = (lambda _: [langdata.load_language_data(s) for s in slugs], None)
+        benchmarks['normalize_all'] = (
+            lambda _: [langdata.normalize_language_data(langdata.load_language_data(s)) for s in slugs],
+            None,
+        )
+
+    results = {}
+    for bench, (func, setup) in benchmarks.items():
+        key = f'{name}/{bench}'
+        if args.only and args.only not in key:
+            continue
+        results[key] = measure(func, setup, min_calls=args.min_calls, min_time=args.min_time)
+        print(f"  {key:<24} {results[key]['median'] * 1000:>10.3f} ms  ({results[key]['calls']} calls)")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print the change against ``baseline`` and return the regressed names."""
+    regressions = []
+    print(f"\n{'benchmark':<24} {'baseline':>12} {'current':>12} {'change':>8}")
+    for key, current in results.items():
+        before = baseline.get(key)
+        if not before:
+            print(f"{key:<24} {'-':>12} {current['median'] * 1000:>10.3f}ms {'new':>8}")
+            continue
+        change = current['median'] / before['median'] - 1 if before['median'] else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print(f"{key:<24} {before['median'] * 1000:>10.3f}ms {current['median'] * 1000:>10.3f}ms {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default='1,10,100', help='comma-separated scale factors for python.json')
+    parser.add_argument('--only', default='', help='only run benchmarks whose name contains this text')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='baseline JSON to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='write these results as the new baseline')
+    parser.add_argument('--output', type=Path, default=None, help='also write the results to this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown before reporting (0.2 = 20%%)')
+    parser.add_argument('--min-calls', type=int, default=5, help='minimum timed calls per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.5, help='minimum seconds spent per benchmark')
+    args = parser.parse_args()
+
+    scales = [int(value) for value in args.scales.split(',') if value.strip()]
+    scratch = Path(tempfile.mkdtemp(prefix='langdata-bench-'))
+    try:
+        langdata, client = prepare_environment(scratch)
+        source = langdata.LANGDATA_DIR
+        results = {}
+        for factor in scales:
+            name = 'real' if factor == 1 else f'x{factor}'
+            print(f"{name}:")
+            results.update(run_dataset(name, factor, source, scratch, langdata, client, args))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding='utf-8')
+
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare(results, baseline.get('results', {}), args.threshold)
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one.")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding='utf-8')
+        print(f"Saved baseline → {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Compile every langdata/*.json into a single pre-normalized snapshot file.
+
+Workers memory-map the snapshot and decode only the language a request needs,
+so startup and first-request latency no longer depend on how many languages
+ship. Entries whose JSON file was saved after the build are ignored at runtime
+and served from the JSON file instead; re-run this script to refresh them.
+
+Usage: python scripts/build_langdata_snapshot.py [--output PATH]
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'keycoding.settings')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', type=Path, default=None, help='snapshot path (defaults to LANGDATA_SNAPSHOT_PATH)')
+    args = parser.parse_args()
+
+    from keycoding.langdata import _snapshot_path, build_language_snapshot
+
+    target = args.output or _snapshot_path()
+    started = time.perf_counter()
+    index = build_language_snapshot(target)
+    elapsed = time.perf_counter() - started
+    size = target.stat().st_size
+    print(f"Built snapshot: {len(index)} languages, {size / 1024:.1f} KiB in {elapsed * 1000:.0f} ms → {target}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Fold langdata journals (langdata/.<slug>.journal) back into their JSON files.
+
+Journals are written when LANGDATA_JOURNAL is enabled. Each compaction takes
+the same per-language lock as the web workers, so it is safe to run while the
+site is serving traffic (e.g. from cron).
+
+Usage: python scripts/compact_langdata.py [slug ...]
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'keycoding.settings')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('slugs', nargs='*', help='languages to compact (defaults to every language)')
+    args = parser.parse_args()
+
+    from keycoding.langdata import compact_language_data, language_slugs
+
+    compacted = 0
+    for slug in args.slugs or language_slugs():
+        if compact_language_data(slug):
+            print(f"compacted {slug}")
+            compacted += 1
+    print(f"Done. {compacted} journal(s) compacted.")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
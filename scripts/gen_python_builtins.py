@@ -7,24 +7,65 @@ Collects:
 - Methods of core types (list/dict/set/tuple/str/int/float/bool/bytes/bytearray/memoryview/range)
 - Builtin exceptions
 - Stdlib modules (sys.stdlib_module_names)
+- With --members, the public functions and classes of each stdlib module
 
-Writes back into langdata/python.json's `builtins` field (replacing it).
+Each collection task (a phase above, or one module's members) is cached in
+.cache/gen_python_builtins/, keyed by the interpreter version, so a re-run
+only introspects what is missing. Uncached tasks run in a process pool. The
+pool also isolates module imports: each task gets --timeout seconds from
+submission, and a hung worker is killed. Modules with import side effects
+(MEMBER_SKIP) are never imported. If any task fails or times out,
+python.json is left untouched and the exit status is 1.
+
+Writes back into langdata/python.json's `builtins` field (replacing it), but
+only when its content hash changed. The read-modify-write holds
+keycoding.langdata.language_data_lock('python'), the lock save_language_data
+takes, and re-checks for a pending edit journal under it, so an edit saved by
+the site while introspection runs is not overwritten.
+
+Usage: python scripts/gen_python_builtins.py [--members] [--max-members 50]
+                                             [--workers N] [--timeout 10]
+                                             [--no-cache]
 """
 from __future__ import annotations
+import argparse
+import contextlib
+import hashlib
+import importlib
 import inspect
 import json
+import multiprocessing
+import os
 import sys
+import tempfile
+import time
 import builtins as bi
 from pathlib import Path
 from types import BuiltinFunctionType, FunctionType
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'keycoding.settings')
+
+from keycoding.langschema import canonicalize_document  # noqa: E402  (Django-free)
+
 JSON_PATH = ROOT / 'langdata' / 'python.json'
+JOURNAL_PATH = ROOT / 'langdata' / '.python.journal'
+CACHE_DIR = ROOT / '.cache' / 'gen_python_builtins'
+# Bump when the collectors change so stale cache entries are ignored.
+CACHE_FORMAT = 1
+
+# Importing these opens windows or browsers, prints, or starts services.
+MEMBER_SKIP = {
+    'antigravity', 'this', 'idlelib', 'tkinter', 'turtle', 'turtledemo',
+    'ensurepip', 'venv', 'pydoc_data', 'lib2to3', '__main__', '__future__',
+}
 
 
 def first_line(doc: str | None) -> str:
-    if not doc:
+    # Some descriptors (e.g. in types) expose a non-string __doc__.
+    if not doc or not isinstance(doc, str):
         return ""
     return doc.strip().splitlines()[0].strip()
 
@@ -133,6 +174,127 @@ def collect_stdlib_modules(out: List[Dict[str, Any]]):
         add_entry(out, name, 'module', f"import {name}", 'Standard library module.', 'Stdlib')
 
 
+def collect_module_members(out: List[Dict[str, Any]], module_name: str, limit: int):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        module = importlib.import_module(module_name)
+    names = getattr(module, '__all__', None)
+    if not isinstance(names, (list, tuple)):
+        names = [name for name in dir(module) if not name.startswith('_')]
+    count = 0
+    for attr in sorted(set(names)):
+        if count >= limit:
+            break
+        obj = getattr(module, attr, None)
+        if inspect.isclass(obj):
+            kind, sig = 'class', f"{module_name}.{attr}(...)"
+        elif callable(obj):
+            kind, sig = 'function', f"{module_name}.{safe_signature(obj)}"
+        else:
+            continue
+        # Skip names a module merely re-exports from elsewhere.
+        if getattr(obj, '__module__', module_name) not in (module_name, f"_{module_name}") and not hasattr(module, '__all__'):
+            continue
+        add_entry(out, f"{module_name}.{attr}", kind, sig, first_line(getattr(obj, '__doc__', None)), 'Stdlib')
+        count += 1
+
+
+# Task key -> collector; member tasks are 'members:<module>'.
+PHASES = {
+    'functions': collect_builtins_functions,
+    'types': collect_builtin_types,
+    'methods': collect_core_methods,
+    'exceptions': collect_exceptions,
+    'modules': collect_stdlib_modules,
+}
+
+
+def stdlib_member_modules() -> List[str]:
+    return sorted(
+        name for name in getattr(sys, 'stdlib_module_names', set())
+        if not name.startswith('_') and name not in MEMBER_SKIP
+    )
+
+
+def run_task(key: str, max_members: int) -> List[Dict[str, Any]]:
+    """Run one collection task; runs in a pool worker."""
+    out: List[Dict[str, Any]] = []
+    if key.startswith('members:'):
+        try:
+            collect_module_members(out, key.split(':', 1)[1], max_members)
+        except ImportError:
+            # Not available on this platform (winreg, msvcrt, ...); cached
+            # as empty like any other result for this interpreter.
+            pass
+    else:
+        PHASES[key](out)
+    return out
+
+
+def cache_path() -> Path:
+    version = hashlib.sha1(sys.version.encode('utf-8')).hexdigest()[:10]
+    return CACHE_DIR / f"{sys.implementation.cache_tag}-{version}.json"
+
+
+def load_cache(path: Path, max_members: int) -> Dict[str, Any]:
+    try:
+        cache = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if cache.get('format') != CACHE_FORMAT or cache.get('python') != sys.version:
+        return {}
+    tasks = cache.get('tasks') or {}
+    if cache.get('max_members') != max_members:
+        tasks = {key: value for key, value in tasks.items() if not key.startswith('members:')}
+    return tasks
+
+
+def save_cache(path: Path, tasks: Dict[str, Any], max_members: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {'format': CACHE_FORMAT, 'python': sys.version, 'max_members': max_members, 'tasks': tasks}
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        json.dump(payload, fh)
+    os.replace(tmp, path)
+
+
+def run_tasks(keys: List[str], args) -> Tuple[Dict[str, Any], List[str]]:
+    """Run ``keys`` in a pool; return (results, failures).
+
+    At most --workers tasks are in flight, and each must finish within
+    --timeout seconds of being submitted. The first failure stops the run,
+    since an incomplete result must not replace the builtins section.
+    """
+    if not keys:
+        return {}, []
+    if len(keys) == 1 and not keys[0].startswith('members:'):
+        return {keys[0]: run_task(keys[0], args.max_members)}, []
+    results: Dict[str, Any] = {}
+    workers = max(1, min(args.workers, len(keys)))
+    queue = list(reversed(keys))
+    running: Dict[str, Tuple[Any, float]] = {}
+    pool = multiprocessing.Pool(processes=workers, maxtasksperchild=20)
+    try:
+        while queue or running:
+            while queue and len(running) < workers:
+                key = queue.pop()
+                running[key] = (pool.apply_async(run_task, (key, args.max_members)), time.monotonic() + args.timeout)
+            for key, (result, deadline) in list(running.items()):
+                if result.ready():
+                    del running[key]
+                    try:
+                        results[key] = result.get()
+                    except Exception as exc:
+                        return results, [f"{key}: {type(exc).__name__}: {exc}"]
+                elif time.monotonic() > deadline:
+                    return results, [f"{key}: timed out after {args.timeout:g}s"]
+            time.sleep(0.005)
+    finally:
+        # Kills workers stuck in an import instead of waiting for them.
+        pool.terminate()
+        pool.join()
+    return results, []
+
+
 def unique_by_name(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     seen = set()
     out: List[Dict[str, Any]] = []
@@ -145,23 +307,90 @@ def unique_by_name(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return out
 
 
+def content_hash(items: List[Dict[str, Any]]) -> str:
+    return hashlib.sha256(json.dumps(items, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def language_data_lock(slug: str):
+    """keycoding.langdata.language_data_lock, setting Django up on first use.
+
+    Called after the pool has finished, so workers never load Django.
+    """
+    import django
+
+    django.setup()
+    from keycoding.langdata import language_data_lock
+
+    return language_data_lock(slug)
+
+
+def write_builtins(items: List[Dict[str, Any]]) -> int:
+    """Replace python.json's builtins with ``items`` under the language lock."""
+    with language_data_lock(JSON_PATH.stem):
+        if JOURNAL_PATH.exists():
+            print(f"{JOURNAL_PATH.name} appeared while introspecting; run scripts/compact_langdata.py first")
+            return 1
+        data = json.loads(JSON_PATH.read_text(encoding='utf-8'))
+        if content_hash(data.get('builtins') or []) == content_hash(items):
+            print(f"Builtins unchanged: {len(items)} entries; {JSON_PATH} not rewritten")
+            return 0
+        data['builtins'] = items
+        # Canonical and schema-stamped like save_language_data's output, in the
+        # same format, written atomically.
+        data = canonicalize_document(data)
+        fd, tmp = tempfile.mkstemp(prefix=f".{JSON_PATH.name}.", suffix='.tmp', dir=JSON_PATH.parent)
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+        os.replace(tmp, JSON_PATH)
+    print(f"Updated builtins: {len(items)} entries → {JSON_PATH}")
+    return 0
+
+
 def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--members', action='store_true', help='also list public functions and classes of stdlib modules')
+    parser.add_argument('--max-members', type=int, default=50, help='members listed per module')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='introspection processes')
+    parser.add_argument('--timeout', type=float, default=10.0, help='seconds allowed per task')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and do not update the introspection cache')
+    args = parser.parse_args()
+
+    # Checked again under the lock before writing; this saves a wasted run.
+    if JOURNAL_PATH.exists():
+        print(f"{JOURNAL_PATH.name} has pending edits; run scripts/compact_langdata.py first")
+        return 1
+
+    started = time.perf_counter()
+    keys = list(PHASES)
+    if args.members:
+        keys += [f"members:{name}" for name in stdlib_member_modules()]
+    path = cache_path()
+    cached = {} if args.no_cache else load_cache(path, args.max_members)
+    missing = [key for key in keys if key not in cached]
+    fresh, failures = run_tasks(missing, args)
+    if fresh and not args.no_cache:
+        # Keep the work that did finish for the next run.
+        save_cache(path, {**cached, **fresh}, args.max_members)
+    if failures:
+        for failure in failures:
+            print(f"  failed {failure}")
+        print(f"Not all tasks completed; {JSON_PATH} left unchanged")
+        return 1
+    tasks = {**cached, **fresh}
+    print(f"Introspected {len(fresh)} of {len(keys)} tasks ({len(keys) - len(missing)} cached) "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+
     items: List[Dict[str, Any]] = []
-    collect_builtins_functions(items)
-    collect_builtin_types(items)
-    collect_core_methods(items)
-    collect_exceptions(items)
-    collect_stdlib_modules(items)
+    # Assemble in task order, not completion order, so duplicates resolve the
+    # same way on every run.
+    for key in keys:
+        items.extend(tasks[key])
 
     items = unique_by_name(items)
     # stable sort: by category group, then name
     items.sort(key=lambda x: (x.get('category',''), x.get('name', '')))
 
-    data = json.loads(JSON_PATH.read_text(encoding='utf-8'))
-    data['builtins'] = items
-    JSON_PATH.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
-    print(f"Updated builtins: {len(items)} entries → {JSON_PATH}")
-    return 0
+    return write_builtins(items)
 
 
 if __name__ == '__main__':
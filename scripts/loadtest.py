@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Load-test the whole site on this machine and report per-endpoint throughput and latency.
+
+The script starts the app in a child process on a free local port. The child
+uses a scratch copy of langdata/ and a scratch SQLite database with a
+regular user and a superuser, so nothing real is modified. Virtual users
+then replay a weighted traffic model in threads:
+
+  landing      anonymous GET /
+  login        full login flow (form GET + credential POST) with a fresh session
+  dashboard    GET /dashboard/
+  language     GET /dashboard/<slug>/
+  builtins     GET /dashboard/<slug>/builtins/?q=...
+  edit         superuser POST of an in-place edit (update_tip on python)
+
+Against --url the edit traffic is left out unless --allow-edits is given,
+since it rewrites the first Python tip on that server. Every login is
+checked: a run stops before measuring if the test users cannot log in, and
+a failed login under load counts as an error.
+
+Use --users/--duration for a fixed run, or --ramp to double the number of
+users each stage until throughput stops growing, p95 passes --p95-limit or
+the error rate passes --error-limit. The last stage before that is reported
+as the saturation point.
+
+The load generator shares a machine (and its CPUs) with the server; run it
+from a second host with --url for numbers that are not skewed by that.
+
+Usage: python scripts/loadtest.py [--users 8 --duration 20] [--ramp]
+                                  [--stage-seconds 10] [--max-users 256]
+                                  [--url http://host:port [--allow-edits]]
+                                  [--output PATH]
+"""
+from __future__ import annotations
+import argparse
+import http.cookiejar
+import json
+import logging
+import os
+import random
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'keycoding.settings')
+
+USER = ('loadtest', 'loadtest-password-1')
+SUPERUSER = ('loadtest-admin', 'loadtest-password-2')
+
+# endpoint -> relative weight of the traffic model
+TRAFFIC = {
+    'landing': 15,
+    'login': 4,
+    'dashboard': 20,
+    'language': 35,
+    'builtins': 22,
+    'edit': 4,
+}
+BUILTIN_QUERIES = ['map', 'str', 'len', 'open', 'sort', 'print', 'list', 'int', 'read', 'format']
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+# Django's default SESSION_COOKIE_NAME; login() issues a new one on success.
+SESSION_COOKIE = 'sessionid'
+
+
+# --- server -----------------------------------------------------------------
+
+def serve(port: int, scratch: Path) -> None:
+    """Child process: run the app against scratch data until killed."""
+    # Keep the scratch users' sessions and cached users out of the real
+    # auth cache; read when the settings module loads below.
+    os.environ['AUTH_CACHE_DIR'] = str(scratch / 'auth-cache')
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = scratch / 'db.sqlite3'
+    settings.LANGDATA_SNAPSHOT_PATH = scratch / 'langdata' / '.snapshot.bin'
+    settings.SEARCH_INDEX_PATH = scratch / 'search-index'
+    settings.DEBUG = False
+
+    import django
+    django.setup()
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.core.servers.basehttp import run
+    from django.core.wsgi import get_wsgi_application
+
+    from keycoding import langdata, metrics, profiling
+
+    langdata.LANGDATA_DIR = scratch / 'langdata'
+    metrics.METRICS_DIR = scratch / 'metrics'
+    profiling.PROFILE_DIR = scratch / 'profiles'
+
+    call_command('migrate', verbosity=0, interactive=False)
+    User.objects.create_user(USER[0], 'loadtest@example.com', USER[1])
+    User.objects.create_superuser(SUPERUSER[0], 'loadtest-admin@example.com', SUPERUSER[1])
+    application = get_wsgi_application()
+    # One access log line per request would swamp the report; set after
+    # get_wsgi_application(), which reconfigures logging.
+    logging.getLogger('django.server').setLevel(logging.ERROR)
+    print('ready', flush=True)
+    run('127.0.0.1', port, application, threading=True)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(scratch: Path) -> tuple:
+    shutil.copytree(ROOT / 'langdata', scratch / 'langdata')
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, __file__, '--serve', str(port), '--scratch', str(scratch)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = proc.stdout.readline().strip()
+    if line != 'ready':
+        proc.kill()
+        raise SystemExit('Server failed to start')
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(base + '/', timeout=1).read()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return proc, base
+
+
+# --- clients ----------------------------------------------------------------
+
+class Session:
+    """One browser: a cookie jar plus helpers that time each request."""
+
+    def __init__(self, base: str, recorder: 'Recorder'):
+        self.base = base
+        self.recorder = recorder
+        self.jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.jar))
+
+    def cookie(self, name: str) -> str:
+        return next((cookie.value for cookie in self.jar if cookie.name == name), '')
+
+    def csrf_cookie(self) -> str:
+        return self.cookie('csrftoken')
+
+    def request(self, endpoint: str, path: str, data: dict = None, *, record: bool = True) -> str:
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base + path, data=body, headers={'Referer': self.base + path})
+        started = time.perf_counter()
+        error = False
+        text = ''
+        try:
+            with self.opener.open(req, timeout=30) as response:
+                text = response.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as exc:
+            error = exc.code >= 400
+        except OSError:
+            error = True
+        if record:
+            self.recorder.add(endpoint, time.perf_counter() - started, error)
+        return text
+
+    def login(self, credentials, endpoint: str = 'login', record: bool = True) -> bool:
+        """Log in; True when the server started a new session for the user.
+
+        A rejected login re-renders the form with 200, so success is judged
+        by the session cookie, which Django replaces on login.
+        """
+        page = self.request(endpoint, '/accounts/login/', record=record)
+        match = CSRF_INPUT_RE.search(page)
+        before = self.cookie(SESSION_COOKIE)
+        started = time.perf_counter()
+        self.request(endpoint, '/accounts/login/', {
+            'username': credentials[0],
+            'password': credentials[1],
+            'csrfmiddlewaretoken': match.group(1) if match else self.csrf_cookie(),
+        }, record=False)
+        ok = self.cookie(SESSION_COOKIE) not in ('', before)
+        if record:
+            self.recorder.add(endpoint, time.perf_counter() - started, not ok)
+        return ok
+
+
+class Recorder:
+    def __init__(self, traffic: dict):
+        self.lock = threading.Lock()
+        self.samples = {endpoint: [] for endpoint in traffic}
+        self.errors = {endpoint: 0 for endpoint in traffic}
+
+    def add(self, endpoint: str, seconds: float, error: bool) -> None:
+        with self.lock:
+            self.samples[endpoint].append(seconds)
+            if error:
+                self.errors[endpoint] += 1
+
+
+def virtual_user(base: str, slugs: list, traffic: dict, recorder: Recorder, start: threading.Barrier,
+                 seconds: float, seed: int) -> None:
+    rng = random.Random(seed)
+    user = Session(base, recorder)
+    admin = Session(base, recorder)
+    logged_in = user.login(USER, record=False)
+    if 'edit' in traffic:
+        logged_in = logged_in and admin.login(SUPERUSER, record=False)
+        admin.request('edit', '/dashboard/python/?manage=1', record=False)
+    anonymous = Session(base, recorder)
+    endpoints = list(traffic)
+    weights = list(traffic.values())
+
+    # Sessions are set up before the measured window opens; a failed login
+    # breaks the barrier and stops the run instead of measuring redirects.
+    try:
+        if not logged_in:
+            start.abort()
+        start.wait()
+    except threading.BrokenBarrierError:
+        return
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        endpoint = rng.choices(endpoints, weights)[0]
+        if endpoint == 'landing':
+            anonymous.request(endpoint, '/')
+        elif endpoint == 'login':
+            Session(base, recorder).login(USER)
+        elif endpoint == 'dashboard':
+            user.request(endpoint, '/dashboard/')
+        elif endpoint == 'language':
+            user.request(endpoint, f'/dashboard/{rng.choice(slugs)}/')
+        elif endpoint == 'builtins':
+            query = urllib.parse.quote(rng.choice(BUILTIN_QUERIES))
+            user.request(endpoint, f'/dashboard/{rng.choice(slugs)}/builtins/?q={query}')
+        else:
+            admin.request(endpoint, '/dashboard/python/?manage=1', {
+                'action': 'update_tip',
+                'index': '0',
+                'title': 'Load test',
+                'note': f'Edited by virtual user {seed} at {time.time():.3f}',
+                'csrfmiddlewaretoken': admin.csrf_cookie(),
+            })
+
+
+def run_stage(base: str, slugs: list, traffic: dict, users: int, seconds: float) -> dict:
+    recorder = Recorder(traffic)
+    start = threading.Barrier(users + 1)
+    threads = [
+        threading.Thread(target=virtual_user, args=(base, slugs, traffic, recorder, start, seconds, seed), daemon=True)
+        for seed in range(users)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        raise SystemExit('A virtual user could not log in; stopping the run')
+    started = time.monotonic()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    return summarize(recorder, elapsed, users)
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def summarize(recorder: Recorder, elapsed: float, users: int) -> dict:
+    endpoints = {}
+    everything = []
+    errors = 0
+    for endpoint, samples in recorder.samples.items():
+        ordered = sorted(samples)
+        everything.extend(ordered)
+        errors += recorder.errors[endpoint]
+        endpoints[endpoint] = {
+            'requests': len(ordered),
+            'rps': len(ordered) / elapsed,
+            'error_rate': recorder.errors[endpoint] / len(ordered) if ordered else 0.0,
+            'p50': _percentile(ordered, 50),
+            'p95': _percentile(ordered, 95),
+            'p99': _percentile(ordered, 99),
+        }
+    everything.sort()
+    return {
+        'users': users,
+        'seconds': elapsed,
+        'requests': len(everything),
+        'rps': len(everything) / elapsed,
+        'error_rate': errors / len(everything) if everything else 0.0,
+        'p50': _percentile(everything, 50),
+        'p95': _percentile(everything, 95),
+        'p99': _percentile(everything, 99),
+        'mean': statistics.fmean(everything) if everything else 0.0,
+        'endpoints': endpoints,
+    }
+
+
+def print_report(stage: dict) -> None:
+    print(f"\n{stage['users']} users, {stage['seconds']:.1f}s: {stage['requests']} requests, "
+          f"{stage['rps']:.1f} req/s, errors {stage['error_rate']:.2%}, "
+          f"p50 {stage['p50'] * 1000:.0f}ms p95 {stage['p95'] * 1000:.0f}ms p99 {stage['p99'] * 1000:.0f}ms")
+    print(f"  {'endpoint':<10} {'requests':>8} {'req/s':>8} {'errors':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, row in stage['endpoints'].items():
+        print(f"  {endpoint:<10} {row['requests']:>8} {row['rps']:>8.1f} {row['error_rate']:>7.2%} "
+              f"{row['p50'] * 1000:>6.0f}ms {row['p95'] * 1000:>6.0f}ms {row['p99'] * 1000:>6.0f}ms")
+
+
+def check_logins(base: str, traffic: dict) -> None:
+    """Fail fast when the test accounts cannot log in to ``base``."""
+    recorder = Recorder(traffic)
+    accounts = [USER, SUPERUSER] if 'edit' in traffic else [USER]
+    for credentials in accounts:
+        if not Session(base, recorder).login(credentials, record=False):
+            raise SystemExit(f"Login as {credentials[0]!r} failed at {base}/accounts/login/; "
+                             "create the account or check the server")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=8, help='concurrent virtual users for a fixed run')
+    parser.add_argument('--duration', type=float, default=20, help='seconds for a fixed run')
+    parser.add_argument('--ramp', action='store_true', help='double users per stage to find the saturation point')
+    parser.add_argument('--stage-seconds', type=float, default=10, help='seconds per ramp stage')
+    parser.add_argument('--max-users', type=int, default=256, help='stop ramping at this many users')
+    parser.add_argument('--p95-limit', type=float, default=1000, help='ramp stops once p95 exceeds this many ms')
+    parser.add_argument('--error-limit', type=float, default=0.01, help='ramp stops once the error rate exceeds this')
+    parser.add_argument('--url', default='', help='test an already running server instead of starting one')
+    parser.add_argument('--allow-edits', action='store_true',
+                        help='with --url, include the edit traffic, which modifies that server\'s data')
+    parser.add_argument('--output', type=Path, default=None, help='write every stage to this JSON file')
+    parser.add_argument('--serve', type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument('--scratch', type=Path, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.scratch)
+        return 0
+
+    slugs = sorted(path.stem for path in (ROOT / 'langdata').glob('*.json') if not path.name.startswith('.'))
+    traffic = dict(TRAFFIC)
+    if args.url and not args.allow_edits:
+        del traffic['edit']
+        print("Leaving out edit traffic against --url; pass --allow-edits to include it")
+    scratch = Path(tempfile.mkdtemp(prefix='keycoding-load-'))
+    server = None
+    try:
+        if args.url:
+            base = args.url.rstrip('/')
+        else:
+            server, base = start_server(scratch)
+            print(f"Serving scratch copy at {base}")
+        check_logins(base, traffic)
+
+        stages = []
+        if not args.ramp:
+            stages.append(run_stage(base, slugs, traffic, args.users, args.duration))
+            print_report(stages[-1])
+        else:
+            users = 1
+            best = None
+            while users <= args.max_users:
+                stage = run_stage(base, slugs, traffic, users, args.stage_seconds)
+                stages.append(stage)
+                print_report(stage)
+                saturated = (
+                    stage['error_rate'] > args.error_limit
+                    or stage['p95'] * 1000 > args.p95_limit
+                    or (best is not None and stage['rps'] < best['rps'] * 1.05)
+                )
+                if saturated:
+                    break
+                best = stage
+                users *= 2
+            if best is None:
+                print("\nSaturated at 1 user.")
+            else:
+                print(f"\nSaturation point: about {best['users']} concurrent users, "
+                      f"{best['rps']:.1f} req/s at p95 {best['p95'] * 1000:.0f}ms.")
+        if args.output:
+            args.output.write_text(json.dumps(stages, indent=2) + "\n", encoding='utf-8')
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        shutil.rmtree(scratch, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,89 +1,214 @@
 #!/usr/bin/env python3
 """
-Normalize langdata/*.json to share a common structure so the dashboard renders consistently.
-
-Ensures the following top-level keys exist with sensible defaults:
-- name: str (unchanged)
-- slug: str (unchanged)
-- version: str (unchanged)
-- quick_start: list
-- concepts: list
-- common_tasks: list
-- stdlib: list
-- tools: list
-- links: list
-- builtins: list
-- projects: list
-- glossary: list
-- tips: list
-
-Also gently normalizes tools/links entries to be lists, and prints a short report.
+Normalize langdata/*.json to the shape the dashboard renders.
+
+The rules live in keycoding/langschema.py and are the same ones
+keycoding.langdata.normalize_language_data applies at runtime. Files are
+rewritten in the same format save_language_data uses, stamped with the
+schema version so the site loads them without normalizing them again.
+Unlike at runtime, keys that the schema does not know are kept, so data
+such as builtins' category is not lost.
+
+Runs are incremental. langdata/.normalize-manifest.json records the size,
+mtime and SHA-256 of every file known to be normalized under the current
+rules. Files whose stat still matches are skipped without being read.
+Files whose content hash still matches are skipped after one hash. Only the
+rest are parsed, in a process pool. Editing langschema.py invalidates the
+whole manifest.
+
+--check writes nothing and exits 1 if any file would change. When nothing
+changed it finishes after one stat per file. Files with a pending edit
+journal are left alone; fold them in with scripts/compact_langdata.py.
+
+Each rewrite holds keycoding.langdata.language_data_lock for its file, the
+lock save_language_data takes, and checks for a journal again under it, so
+an edit made by the site while the script runs is never overwritten.
+Django is only set up in processes that rewrite a file.
+
+Usage: python scripts/normalize_langdata.py [--check] [--force] [--workers N]
 """
 from __future__ import annotations
+import argparse
+import hashlib
 import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'keycoding.settings')
+
+from keycoding import langschema  # noqa: E402  (Django-free)
+
 LD = ROOT / 'langdata'
+MANIFEST = LD / '.normalize-manifest.json'
+REPORT_KEYS = ('quick_start', 'concepts', 'common_tasks', 'projects', 'glossary', 'tips')
 
-REQUIRED_LIST_KEYS = [
-    'quick_start', 'concepts', 'common_tasks', 'stdlib', 'tools', 'links',
-    'builtins', 'projects', 'glossary', 'tips'
-]
-
-def normalize_file(p: Path) -> tuple[bool, dict]:
-    raw = json.loads(p.read_text(encoding='utf-8'))
-    changed = False
-    for k in REQUIRED_LIST_KEYS:
-        if k not in raw or raw[k] is None:
-            raw[k] = []
-            changed = True
-        elif not isinstance(raw[k], list):
-            # Coerce to list when a single object/string is present
-            raw[k] = [ raw[k] ]
-            changed = True
-
-    # Normalize tools: allow strings or objects; nothing to coerce further
-    # Normalize links: ensure entries have title/url when objects
-    def fix_links(lst):
-        new = []
-        for it in lst:
-            if isinstance(it, str):
-                new.append({'title': it, 'url': it})
-            elif isinstance(it, dict):
-                if 'title' in it and 'url' in it:
-                    new.append(it)
-                else:
-                    # skip malformed link silently
-                    continue
-            else:
-                continue
-        return new
-    links_fixed = fix_links(raw.get('links', []))
-    if links_fixed != raw.get('links', []):
-        raw['links'] = links_fixed
-        changed = True
 
-    # Ensure builtins is a list of dicts
-    if not all(isinstance(x, dict) for x in raw.get('builtins', [])):
-        raw['builtins'] = [x for x in raw['builtins'] if isinstance(x, dict)]
-        changed = True
+def rules_fingerprint() -> str:
+    return hashlib.sha256(Path(langschema.__file__).read_bytes()).hexdigest()
+
+
+def load_manifest(rules: str) -> dict:
+    try:
+        manifest = json.loads(MANIFEST.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('rules') != rules:
+        return {}
+    return manifest.get('files') or {}
+
+
+def save_manifest(rules: str, files: dict) -> None:
+    payload = json.dumps({'rules': rules, 'files': files}, indent=1, sort_keys=True) + "\n"
+    fd, tmp = tempfile.mkstemp(prefix=f".{MANIFEST.name}.", suffix='.tmp', dir=LD)
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        fh.write(payload)
+    os.replace(tmp, MANIFEST)
+
+
+def encode(doc: dict) -> bytes:
+    # Same format as keycoding.langdata._write_document.
+    return (json.dumps(doc, indent=2, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+def language_data_lock(slug: str):
+    """keycoding.langdata.language_data_lock, setting Django up on first use."""
+    import django
+
+    django.setup()
+    from keycoding.langdata import language_data_lock
+
+    return language_data_lock(slug)
+
+
+def _journal(p: Path) -> Path:
+    return p.parent / f'.{p.stem}.journal'
+
+
+def normalize_file(path: str, write: bool) -> dict:
+    """Normalize one file; runs in a pool worker.
+
+    Writing happens under the file's language data lock, after checking
+    again that no edit journal appeared since the directory was scanned.
+    """
+    p = Path(path)
+    if not write:
+        return _normalize(p, False)
+    with language_data_lock(p.stem):
+        if _journal(p).exists():
+            return {'name': p.name, 'blocked': True}
+        return _normalize(p, True)
+
+
+def _normalize(p: Path, write: bool) -> dict:
+    original = p.read_bytes()
+    doc = langschema.canonicalize_document(json.loads(original))
+    encoded = encode(doc)
+    changed = encoded != original
+    if changed and write:
+        fd, tmp = tempfile.mkstemp(prefix=f".{p.name}.", suffix='.tmp', dir=p.parent)
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(encoded)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, p)
+    st = p.stat()
+    return {
+        'name': p.name,
+        'blocked': False,
+        'changed': changed,
+        'entry': {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': hashlib.sha256(encoded).hexdigest()},
+        'counts': {key: len(doc.get(key, [])) for key in REPORT_KEYS},
+    }
+
+
+def _stat_entry(st: os.stat_result, digest: str) -> dict:
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
 
-    if changed:
-        p.write_text(json.dumps(raw, indent=2, ensure_ascii=False), encoding='utf-8')
-    return changed, {k: len(raw.get(k, [])) for k in REQUIRED_LIST_KEYS}
 
 def main() -> int:
-    files = sorted(LD.glob('*.json'))
-    any_changed = False
-    for p in files:
-        changed, summary = normalize_file(p)
-        flag = 'UPDATED' if changed else 'ok'
-        print(f"{flag:7} {p.name} -> " + ", ".join(f"{k}:{summary[k]}" for k in ('quick_start','concepts','common_tasks','projects','glossary','tips')))
-        any_changed = any_changed or changed
-    print('Done.' + (' (changes written)' if any_changed else ''))
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--check', action='store_true', help='report files that need normalizing; write nothing')
+    parser.add_argument('--force', action='store_true', help='ignore the manifest and process every file')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='processes for changed files')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rules = rules_fingerprint()
+    known = {} if args.force else load_manifest(rules)
+    manifest = {}
+    todo = []
+    blocked = []
+    unchanged = 0
+    for p in sorted(LD.glob('*.json')):
+        if p.name.startswith('.'):
+            continue
+        if _journal(p).exists():
+            blocked.append(p.name)
+            continue
+        st = p.stat()
+        entry = known.get(p.name)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            manifest[p.name] = entry
+            unchanged += 1
+            continue
+        if entry and entry['size'] == st.st_size:
+            # Touched but maybe not edited: one hash settles it.
+            digest = hashlib.sha256(p.read_bytes()).hexdigest()
+            if digest == entry['sha256']:
+                manifest[p.name] = _stat_entry(st, digest)
+                unchanged += 1
+                continue
+        todo.append(p)
+
+    write = not args.check
+    results = []
+    failed = []
+    if len(todo) > 1 and args.workers > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(todo))) as pool:
+            futures = [(p, pool.submit(normalize_file, str(p), write)) for p in todo]
+            for p, future in futures:
+                try:
+                    results.append(future.result())
+                except (OSError, ValueError) as exc:
+                    failed.append((p.name, exc))
+    else:
+        for p in todo:
+            try:
+                results.append(normalize_file(str(p), write))
+            except (OSError, ValueError) as exc:
+                failed.append((p.name, exc))
+
+    would_change = []
+    for result in results:
+        if result['blocked']:
+            blocked.append(result['name'])
+            continue
+        if result['changed']:
+            would_change.append(result['name'])
+        if write or not result['changed']:
+            manifest[result['name']] = result['entry']
+        flag = ('NEEDS' if args.check else 'UPDATED') if result['changed'] else 'ok'
+        print(f"{flag:7} {result['name']} -> " + ", ".join(f"{k}:{result['counts'][k]}" for k in REPORT_KEYS))
+    for name, exc in failed:
+        print(f"ERROR   {name}: {exc}")
+    for name in blocked:
+        print(f"SKIPPED {name}: pending journal; run scripts/compact_langdata.py first")
+
+    if write:
+        save_manifest(rules, manifest)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"Done in {elapsed:.0f} ms: {unchanged} unchanged, {len(results)} checked"
+          + (f", {len(would_change)} {'need normalizing' if args.check else 'rewritten'}" if would_change else ''))
+    if failed or (args.check and would_change):
+        return 1
     return 0
 
+
 if __name__ == '__main__':
     raise SystemExit(main())
-
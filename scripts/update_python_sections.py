@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import json
+import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
 P = ROOT / 'langdata' / 'python.json'
 
+from keycoding.langschema import canonicalize_document  # noqa: E402  (Django-free)
+
 def main() -> int:
     data = json.loads(P.read_text(encoding='utf-8'))
 
@@ -127,7 +131,10 @@ def main() -> int:
         {'title':'Help','note':'Use help(name) in the REPL to read docs quickly.'},
     ]
 
-    P.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+    # Stored canonical and schema-stamped, as save_language_data does, so the
+    # site can keep skipping normalization for this file.
+    data = canonicalize_document(data)
+    P.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
     print('Updated sections: common_tasks, projects, glossary, tips')
     return 0
 
@@ -1,47 +1,90 @@
-// Simple client-side filter for built-ins table (supports single or grouped layouts)
+// Built-ins table: filtering and paging are done server-side, the page only
+// ships the first page of rows.
 (function(){
   const input = document.getElementById('bi-filter');
   const count = document.getElementById('bi-count');
   const body = document.getElementById('bi-body');
+  const more = document.getElementById('bi-more');
   if (!body) return;
 
-  let group = 'all';
+  const endpoint = body.dataset.endpoint;
+  const pageSize = parseInt(body.dataset.pageSize, 10) || 50;
   const tabBtns = Array.from(document.querySelectorAll('[data-bi-tab]'));
+  const cellStyles = [
+    'padding:.6rem .9rem; border-bottom:1px solid var(--border); white-space:nowrap;',
+    'padding:.6rem .9rem; border-bottom:1px solid var(--border);',
+    "padding:.6rem .9rem; border-bottom:1px solid var(--border); font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, 'Liberation Mono', 'Courier New', monospace;",
+    'padding:.6rem .9rem; border-bottom:1px solid var(--border);',
+  ];
+
+  let group = 'all';
+  let loaded = body.querySelectorAll('[data-row]').length;
+  let total = parseInt(body.dataset.total, 10) || 0;
+  let request = 0;
+  let timer = null;
+
+  const getQuery = () => ((input && input.value) || '').trim();
+
+  const renderRow = (item) => {
+    const tr = document.createElement('tr');
+    tr.setAttribute('data-row', '');
+    tr.dataset.group = item.group;
+    [item.name, item.kind, item.signature, item.description].forEach((value, i) => {
+      const td = document.createElement('td');
+      td.setAttribute('style', cellStyles[i]);
+      td.textContent = value;
+      tr.appendChild(td);
+    });
+    return tr;
+  };
 
-  const getRows = () => Array.from(body.querySelectorAll('[data-row]'));
+  const renderEmpty = () => {
+    const tr = document.createElement('tr');
+    const td = document.createElement('td');
+    td.colSpan = 4;
+    td.className = 'muted';
+    td.setAttribute('style', 'padding:.6rem .9rem;');
+    td.textContent = 'No matching built-ins.';
+    tr.appendChild(td);
+    return tr;
+  };
 
-  const getQuery = () => ((input && input.value) || '').toLowerCase().trim();
+  const updateStatus = () => {
+    if (count) count.textContent = total + ' matching';
+    if (more) more.hidden = loaded >= total;
+  };
 
-  const update = () => {
-    const rows = getRows();
-    const q = getQuery();
-    let visible = 0;
-    rows.forEach(tr => {
-      const text = tr.innerText.toLowerCase();
-      // Determine group with robust fallback based on Kind column
-      let rowGroup = tr.dataset.group;
-      if (!rowGroup) {
-        const kindCell = tr.children && tr.children[1] ? tr.children[1].innerText.toLowerCase() : '';
-        if (/\b(method|member)\b/.test(kindCell)) rowGroup = 'methods';
-        else if (/\b(class|type|enum|object|struct|interface)\b/.test(kindCell)) rowGroup = 'classes';
-        else if (/\b(module|package|namespace)\b/.test(kindCell)) rowGroup = 'modules';
-        else if (/\b(library|stdlib|standard library)\b/.test(kindCell)) rowGroup = 'libraries';
-        else if (/\b(function|proc|macro|predicate|cmdlet|statement|task)\b/.test(kindCell)) rowGroup = 'functions';
-        else rowGroup = 'functions';
-        tr.dataset.group = rowGroup; // cache for subsequent passes
-      }
-      const matchText = !q || text.includes(q);
-      const matchGroup = group === 'all' || rowGroup === group;
-      const show = matchText && matchGroup;
-      tr.style.display = show ? 'table-row' : 'none';
-      if (show) visible++;
+  const fetchPage = async (append) => {
+    if (!endpoint) return;
+    const ticket = ++request;
+    const params = new URLSearchParams({
+      q: getQuery(),
+      group: group,
+      offset: String(append ? loaded : 0),
+      limit: String(pageSize),
     });
-    if (count) count.textContent = visible + ' matching';
-    // Failsafe: if nothing visible on All with empty search, show everything
-    if (!visible && !q && group === 'all') {
-      rows.forEach(tr => (tr.style.display = 'table-row'));
-      if (count) count.textContent = rows.length + ' matching';
+    let data;
+    try {
+      const res = await fetch(endpoint + '?' + params.toString(), {
+        headers: {'Accept': 'application/json'},
+        credentials: 'same-origin',
+      });
+      if (!res.ok) return;
+      data = await res.json();
+    } catch { return; }
+    // Ignore responses that were overtaken by a newer query.
+    if (ticket !== request) return;
+    const frag = document.createDocumentFragment();
+    data.items.forEach(item => frag.appendChild(renderRow(item)));
+    if (!append) {
+      body.replaceChildren();
+      loaded = 0;
+      if (!data.items.length) frag.appendChild(renderEmpty());
     }
+    body.appendChild(frag);
+    loaded += data.items.length;
+    total = data.total;
+    updateStatus();
   };
 
   const setActive = (name) => {
@@ -51,22 +94,20 @@
       b.classList.toggle('active', active);
       b.setAttribute('aria-pressed', String(active));
     });
-    update();
   };
 
-  tabBtns.forEach(b => b.addEventListener('click', () => setActive(b.dataset.biTab)));
-  const init = () => {
-    // Ensure rows are visible by default, then apply current filter
-    getRows().forEach(tr => tr.style.display = 'table-row');
-    setActive('all');
-  };
-  if (document.readyState === 'loading') {
-    window.addEventListener('DOMContentLoaded', init);
-  } else {
-    init();
-  }
-  window.addEventListener('load', init);
-  if (input) input.addEventListener('input', update);
+  tabBtns.forEach(b => b.addEventListener('click', () => {
+    setActive(b.dataset.biTab);
+    fetchPage(false);
+  }));
+  if (input) input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => fetchPage(false), 150);
+  });
+  if (more) more.addEventListener('click', () => fetchPage(true));
+
+  setActive('all');
+  updateStatus();
 })();
 
 // Copy buttons for code blocks
@@ -0,0 +1,89 @@
+// Manage mode: section editors are fetched when opened instead of being
+// rendered with the page. Open sections are remembered for the tab so they
+// come back after a form submit redirects to this page.
+(function(){
+  const containers = Array.from(document.querySelectorAll('[data-manage-section]'));
+  if (!containers.length) return;
+
+  const storageKey = 'kc-manage-open:' + window.location.pathname;
+
+  const readOpen = () => {
+    try {
+      return JSON.parse(sessionStorage.getItem(storageKey) || '[]');
+    } catch (e) {
+      return [];
+    }
+  };
+
+  const writeOpen = (sections) => {
+    try {
+      sessionStorage.setItem(storageKey, JSON.stringify(sections));
+    } catch (e) {
+      // Storage can be unavailable (private mode); sections just start closed.
+    }
+  };
+
+  const remember = (section) => {
+    const open = readOpen();
+    if (!open.includes(section)) {
+      open.push(section);
+      writeOpen(open);
+    }
+  };
+
+  const fetchPage = (container, offset) => {
+    const url = container.dataset.endpoint + '?offset=' + encodeURIComponent(offset);
+    return fetch(url, {credentials: 'same-origin', headers: {'X-Requested-With': 'XMLHttpRequest'}})
+      .then((res) => {
+        if (!res.ok) throw new Error('Request failed');
+        return res.text();
+      });
+  };
+
+  const load = (container, trigger, offset) => {
+    if (trigger) {
+      trigger.disabled = true;
+      trigger.textContent = 'Loading…';
+    }
+    return fetchPage(container, offset)
+      .then((html) => {
+        const range = document.createRange();
+        range.selectNodeContents(container);
+        const fragment = range.createContextualFragment(html);
+        if (trigger) {
+          trigger.replaceWith(fragment);
+        } else {
+          container.appendChild(fragment);
+        }
+      })
+      .catch(() => {
+        if (trigger) {
+          trigger.disabled = false;
+          trigger.textContent = 'Retry';
+        }
+      });
+  };
+
+  containers.forEach((container) => {
+    const section = container.dataset.manageSection;
+    container.addEventListener('click', (event) => {
+      const open = event.target.closest('[data-manage-open]');
+      if (open) {
+        remember(section);
+        load(container, open, 0);
+        return;
+      }
+      const more = event.target.closest('[data-manage-more]');
+      if (more) {
+        load(container, more, more.dataset.manageMore);
+      }
+    });
+  });
+
+  const reopen = readOpen();
+  containers.forEach((container) => {
+    if (!reopen.includes(container.dataset.manageSection)) return;
+    const open = container.querySelector('[data-manage-open]');
+    if (open) load(container, open, 0);
+  });
+})();